@@ -5,6 +5,9 @@ import utils
 LOGGER = utils.get_program_logger("app", config.LOG_FILES["app"])
 LOGGER.info("App bootstrap started.")
 
+# Global styling is emitted once per run here, ahead of whichever page renders.
+st.markdown(utils.get_global_css(), unsafe_allow_html=True)
+
 # Define pages and their grouping for navigation
 pages = {
     "": [
@@ -29,11 +29,16 @@ from urllib.parse import quote
 import webbrowser
 from decimal import Decimal, InvalidOperation
 import base64
+import hashlib
+import json
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
 import streamlit.components.v1 as components
-from openpyxl import load_workbook
+import xlsxwriter
 
 import config
 import utils
@@ -52,22 +57,9 @@ st.set_page_config(
 )
 
 # ============================================================
-# GLOBAL STYLING / HEADER
+# HEADER
 # ============================================================
-st.markdown(utils.get_global_css(), unsafe_allow_html=True)
-
-LOGO_PATH = config.LOGO_PATH
-logo_b64 = utils.get_logo_base64(str(LOGO_PATH))
-
-st.markdown(
-    f"""
-    <div class="header-row">
-        <img class="header-logo" src="data:image/png;base64,{logo_b64}" />
-        <h1 class="header-title">LS - FedEx Address Validator</h1>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+st.markdown(utils.get_page_header_html("LS - FedEx Address Validator"), unsafe_allow_html=True)
 
 st.divider()
 LOGGER.info("FedEx Address Validator page rendered.")
@@ -80,14 +72,51 @@ FEDEX_EMAIL_TO = "quickresponse6@fedex.com"
 EMAIL_SUBJECT = "Clark National Accounts - Residential Status Dispute"
 
 TABLE_KEY = "results_table"
+# Rows sent to the browser per editor page; larger results are paged.
+EDITOR_PAGE_SIZE = 500
+
+# Source columns never shown in the results table (plus any "Recipient*" column).
+HIDDEN_COLUMNS = {
+    "StreetLine1",
+    "StreetLine2",
+    "PostalCode",
+    "Shipment Date",
+    "OriginalCustomerReference",
+    "Original Customer Reference",
+    "ID",
+    "CountryCode",
+    "Transportation Charge Amount",
+    "City",
+}
+
+
+# Low-cardinality source columns behind the filters, held as category dtype.
+CATEGORY_COLUMNS = (
+    "ResidentialStatusMatch",
+    "Residential Match",
+    "StateOrProvince",
+    "State",
+    "Service Type",
+    "ServiceType",
+    "Service",
+)
+
+
+def is_hidden_column(col_name: str) -> bool:
+    return col_name in HIDDEN_COLUMNS or "recipient" in col_name.lower()
+
+
+def with_category_columns(df: pd.DataFrame) -> pd.DataFrame:
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
 
 
 # ============================================================
 # CACHED DATA LOADING
 # ============================================================
-@st.cache_data
-def load_results(file_path: Path) -> pd.DataFrame:
-    """Load results file with caching to prevent reloading on every interaction."""
+def read_results_csv(file_path: Path) -> pd.DataFrame:
     # CSV reader: tolerate mixed encodings/delimiters and malformed rows.
     last_error: Exception | None = None
     for encoding in ["utf-8-sig", "utf-8", "cp1252", "latin1"]:
@@ -107,11 +136,83 @@ def load_results(file_path: Path) -> pd.DataFrame:
     raise RuntimeError(f"Unable to read results file: {file_path}") from last_error
 
 
+def _results_cache_path(file_path: Path) -> Path:
+    """Local parquet copy of a results CSV, named per source path so copies never collide."""
+    digest = hashlib.sha1(str(file_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return utils.get_user_cache_dir("fedex_results") / f"{file_path.stem}_{digest}.parquet"
+
+
+@st.cache_data
+def load_results(file_path: Path, mtime_ns: int, display_only: bool = False) -> pd.DataFrame:
+    """
+    Load results file with caching to prevent reloading on every interaction.
+    mtime_ns is part of the cache key, so a rewritten results file is never served stale.
+    A local parquet copy is reused while the CSV's (mtime_ns, size) match the pair
+    stored in that copy's metadata. With display_only=True, hidden columns are not read from it.
+    """
+    source_stat = file_path.stat()
+    source_stamp = {
+        "source_mtime_ns": str(source_stat.st_mtime_ns),
+        "source_size": str(source_stat.st_size),
+    }
+    cache_path = _results_cache_path(file_path)
+    if cache_path.exists():
+        try:
+            cache_schema = pq.read_schema(cache_path)
+            cache_stamp = {k.decode(): v.decode() for k, v in (cache_schema.metadata or {}).items()}
+            if all(cache_stamp.get(k) == v for k, v in source_stamp.items()):
+                columns = None
+                if display_only:
+                    columns = [c for c in cache_schema.names if not is_hidden_column(c)]
+                return with_category_columns(pd.read_parquet(cache_path, columns=columns))
+        except Exception as exc:
+            LOGGER.warning("Ignoring unreadable results cache %s: %s", cache_path, exc)
+
+    df = read_results_csv(file_path)
+    try:
+        schema = pa.Schema.from_pandas(df, preserve_index=False).with_metadata(source_stamp)
+        utils.atomic_write_parquet(df, cache_path, schema=schema)
+    except Exception as exc:
+        LOGGER.warning("Could not write results cache %s: %s", cache_path, exc)
+
+    if display_only:
+        df = df[[c for c in df.columns if not is_hidden_column(c)]]
+    return with_category_columns(df)
+
+
+@st.cache_data(show_spinner=False)
+def get_filter_columns(frame: pd.DataFrame) -> dict[str, tuple[list[str], np.ndarray]]:
+    """
+    Per filter column: the sorted multiselect options and the string array the
+    filter mask is tested against, both derived from one decode of the column.
+    """
+    columns: dict[str, tuple[list[str], np.ndarray]] = {}
+    for col in frame.columns:
+        series = frame[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Decode through the codes; a missing value (-1) picks the trailing "".
+            labels = np.append(series.cat.categories.astype(str).to_numpy(dtype=object), "")
+            values = labels[series.cat.codes.to_numpy()]
+        else:
+            values = series.astype(object).fillna("").astype(str).to_numpy()
+        # np.unique sorts and de-duplicates in one pass; blanks stay in the mask
+        # array but are not offered as an option.
+        options = np.unique(values)
+        columns[col] = (options[options != ""].tolist(), values)
+    return columns
+
+
+@st.cache_data(show_spinner=False)
+def parse_invoice_dates(values: pd.Series, date_format: str | None = None) -> np.ndarray:
+    """Invoice dates as datetime64[D], parsed once per column contents (NaT where unparseable)."""
+    return pd.to_datetime(values, format=date_format, errors="coerce").to_numpy(dtype="datetime64[D]")
+
+
 def mark_rows_as_disputed(file_path: Path, row_indices: List[int]) -> None:
     """
     Persist Disputed=1 to the source file using original DataFrame indices.
     """
-    full_df = load_results(file_path)
+    full_df = load_results(file_path, file_path.stat().st_mtime_ns)
     if "Disputed" not in full_df.columns:
         full_df["Disputed"] = ""
 
@@ -131,24 +232,20 @@ if not RESULTS_CSV_FILE.exists():
     st.error(f"Results file not found:\n{RESULTS_CSV_FILE}")
     st.stop()
 
-df = load_results(RESULTS_CSV_FILE)
-LOGGER.info("Loaded FedEx results rows=%s from %s", len(df), RESULTS_CSV_FILE)
-
-if df.empty:
-    LOGGER.info("FedEx results file is empty: %s", RESULTS_CSV_FILE)
-    st.info("No results available.")
-    st.stop()
+results_mtime_ns = RESULTS_CSV_FILE.stat().st_mtime_ns
 
 # ============================================================
 # ATTACHMENT DATA BUILDER
 # ============================================================
-def _first_present(row: pd.Series, candidates: List[str]) -> str:
-    for col in candidates:
-        if col in row.index:
-            value = row.get(col, "")
-            if pd.notna(value) and str(value).strip():
-                return str(value).strip()
-    return ""
+def _first_present(rows: pd.DataFrame, candidates: List[str]) -> pd.Series:
+    """Per row, the first non-blank stripped value among the candidate columns."""
+    result = pd.Series("", index=rows.index, dtype=object)
+    # Walk candidates last-to-first so earlier columns overwrite later ones.
+    for col in reversed(candidates):
+        if col in rows.columns:
+            values = rows[col].astype(object).fillna("").astype(str).str.strip()
+            result = values.where(values != "", result)
+    return result
 
 def normalize_tracking_number(value: object) -> str:
     """Render scientific-notation tracking numbers as plain strings."""
@@ -169,6 +266,25 @@ def normalize_tracking_number(value: object) -> str:
     return text
 
 
+def format_invoice_dates(values: pd.Series) -> np.ndarray:
+    """Render yyyymmdd strings as mm/dd/yyyy ("" where unparseable) with array math, not strftime."""
+    days = pd.to_datetime(values, format="%Y%m%d", errors="coerce").to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(days)
+    days = np.where(valid, days, np.datetime64("1970-01-01", "D"))
+    months = days.astype("datetime64[M]")
+    year = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (days - months).astype(np.int64) + 1
+
+    # Pack as 1mmddyyyy so the int -> str cast keeps zero padding, then drop the
+    # leading 1 and lay the 8 digits into a 10-char buffer pre-filled with "/".
+    packed = (100_000_000 + month * 1_000_000 + day * 10_000 + year).astype("U9")
+    digits = packed.view("U1").reshape(-1, 9)[:, 1:]
+    chars = np.full((len(days), 10), "/", dtype="U1")
+    chars[:, [0, 1, 3, 4, 6, 7, 8, 9]] = digits
+    return np.where(valid, chars.view("U10").ravel(), "")
+
+
 def format_currency_display(value: object) -> str:
     """Render numeric values as currency for table display."""
     num = pd.to_numeric(value, errors="coerce")
@@ -182,29 +298,20 @@ def build_attachment_df(rows: pd.DataFrame) -> pd.DataFrame:
 
     attachment_df = pd.DataFrame(
         {
-            "Account": rows.apply(
-                lambda r: _first_present(
-                    r,
-                    [
-                        "Bill to Account Number",
-                        "Account Number",
-                        "AccountNumber",
-                        "Account",
-                        "Billed Account",
-                    ],
-                ),
-                axis=1,
-            ),
-            "Invoice": rows.apply(
-                lambda r: _first_present(r, ["Invoice", "InvoiceNumber", "Invoice Number"]),
-                axis=1,
-            ),
-            "Tracking Number": rows.apply(
-                lambda r: normalize_tracking_number(
-                    _first_present(r, ["Tracking Number", "InvTrackingNumber", "Tracking"])
-                ),
-                axis=1,
+            "Account": _first_present(
+                rows,
+                [
+                    "Bill to Account Number",
+                    "Account Number",
+                    "AccountNumber",
+                    "Account",
+                    "Billed Account",
+                ],
             ),
+            "Invoice": _first_present(rows, ["Invoice", "InvoiceNumber", "Invoice Number"]),
+            "Tracking Number": _first_present(
+                rows, ["Tracking Number", "InvTrackingNumber", "Tracking"]
+            ).map(normalize_tracking_number),
             "Amount Billed": pd.to_numeric(rows.get("Net Charge Amount"), errors="coerce"),
             "Credit Requested": 2.38,
             "Reason": dispute_reason,
@@ -213,28 +320,31 @@ def build_attachment_df(rows: pd.DataFrame) -> pd.DataFrame:
     return attachment_df
 
 
-def create_excel_download(rows: pd.DataFrame) -> Tuple[str, bytes]:
-    attachment_df = build_attachment_df(rows)
-    timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-    file_name = f"fedex_residential_dispute_{timestamp}.xlsx"
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def _build_xlsx_bytes(rows_json: str) -> bytes:
+    """Serialize attachment rows to XLSX bytes (cached per row selection)."""
+    payload = json.loads(rows_json)
 
-    base_buffer = BytesIO()
-    attachment_df.to_excel(base_buffer, index=False)
-    base_buffer.seek(0)
+    buffer = BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {"in_memory": True})
+    worksheet = workbook.add_worksheet("Disputes")
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    # Currency format for Amount Billed and Credit Requested (0-based columns 3-4).
+    money_format = workbook.add_format({"num_format": "$#,##0.00"})
+    worksheet.set_column(3, 4, 14, money_format)
 
-    # Apply currency formatting to Amount Billed and Credit Requested columns.
-    wb = load_workbook(base_buffer)
-    ws = wb.active
-    currency_cols = [4, 5]  # 1-based indexes in final sheet
-    for col_idx in currency_cols:
-        for row_idx in range(2, ws.max_row + 1):
-            ws.cell(row=row_idx, column=col_idx).number_format = "$#,##0.00"
+    worksheet.write_row(0, 0, payload["columns"], header_format)
+    for row_idx, record in enumerate(payload["data"], start=1):
+        worksheet.write_row(row_idx, 0, record)
+    workbook.close()
+    return buffer.getvalue()
 
-    formatted_buffer = BytesIO()
-    wb.save(formatted_buffer)
-    formatted_buffer.seek(0)
 
-    return file_name, formatted_buffer.getvalue()
+def create_excel_download(rows: pd.DataFrame) -> Tuple[str, bytes]:
+    attachment_df = build_attachment_df(rows)
+    timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+    file_name = f"fedex_residential_dispute_{timestamp}.xlsx"
+    return file_name, _build_xlsx_bytes(attachment_df.to_json(orient="split", index=False))
 
 def trigger_file_download(file_name: str, file_bytes: bytes) -> None:
     """Trigger a browser download in the same click cycle."""
@@ -294,69 +404,74 @@ def open_email(to_addr: str, subject: str, body: str) -> Tuple[bool, str]:
 # ============================================================
 # COLUMN FILTERING AND RENAMING
 # ============================================================
-# Convert InvoiceDate format if it exists (from yyyymmdd to mm/dd/yyyy)
-if "InvoiceDate" in df.columns:
-    df["InvoiceDate"] = pd.to_datetime(df["InvoiceDate"], format="%Y%m%d", errors="coerce").dt.strftime("%m/%d/%Y")
+@st.cache_data(show_spinner=False)
+def prepare_results(file_path: Path, mtime_ns: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Non-disputed result rows plus the display frame built from them.
+    mtime_ns is part of the cache key, so this only reruns when the results file changes.
+    """
+    df = load_results(file_path, mtime_ns, display_only=True)
+
+    # Convert InvoiceDate format if it exists (from yyyymmdd to mm/dd/yyyy)
+    if "InvoiceDate" in df.columns:
+        df["InvoiceDate"] = format_invoice_dates(df["InvoiceDate"])
+
+    # Show only non-disputed rows (empty Disputed values).
+    if "Disputed" in df.columns:
+        disputed_values = df["Disputed"].fillna("").astype(str).str.strip()
+        df = df[disputed_values.eq("")]
+
+    # Build a display-only dataframe (drop returns a new frame, so `df` stays intact
+    # for downstream actions like Excel generation).
+    columns_to_remove = HIDDEN_COLUMNS | {"Disputed"}
+    columns_to_remove.update(col for col in df.columns if "recipient" in col.lower())
+    display_df = df.drop(columns=df.columns.intersection(list(columns_to_remove)))
+
+    # Rename display columns.
+    display_df = display_df.rename(
+        columns={
+            "InvTrackingNumber": "Tracking Number",
+            "ResidentialStatusMatch": "Residential Match",
+        }
+    )
+    if "StateOrProvince" in display_df.columns:
+        if "State" in display_df.columns:
+            display_df = display_df.drop(columns=["StateOrProvince"])
+        else:
+            display_df = display_df.rename(columns={"StateOrProvince": "State"})
 
-# Show only non-disputed rows (empty Disputed values).
-if "Disputed" in df.columns:
-    disputed_values = df["Disputed"].fillna("").astype(str).str.strip()
-    df = df[disputed_values.eq("")]
+    # Ensure tracking values display in full (not scientific notation).
+    tracking_col = next((c for c in ["Tracking Number", "InvTrackingNumber", "Tracking"] if c in display_df.columns), None)
+    if tracking_col:
+        display_df[tracking_col] = display_df[tracking_col].apply(normalize_tracking_number)
 
-# Build a display-only dataframe. Keep `df` intact for downstream actions like Excel generation.
-display_df = df.copy()
+    # Format Net Charge Amount as currency for display.
+    if "Net Charge Amount" in display_df.columns:
+        display_df["Net Charge Amount"] = display_df["Net Charge Amount"].apply(format_currency_display)
 
-# Remove unwanted display columns.
-columns_to_remove = [
-    "StreetLine1",
-    "StreetLine2",
-    "PostalCode",
-    "Shipment Date",
-    "OriginalCustomerReference",
-    "Original Customer Reference",
-    "ID",
-    "CountryCode",
-    "Transportation Charge Amount",
-    "Disputed",
-    "City",
-]
-columns_to_remove.extend([col for col in display_df.columns if "Recipient" in col or "recipient" in col])
-display_df = display_df.drop(columns=[col for col in columns_to_remove if col in display_df.columns])
-
-# Rename display columns.
-display_df = display_df.rename(
-    columns={
-        "InvTrackingNumber": "Tracking Number",
-        "ResidentialStatusMatch": "Residential Match",
-    }
-)
-if "StateOrProvince" in display_df.columns:
-    if "State" in display_df.columns:
-        display_df = display_df.drop(columns=["StateOrProvince"])
-    else:
-        display_df = display_df.rename(columns={"StateOrProvince": "State"})
-
-# Ensure tracking values display in full (not scientific notation).
-tracking_col = next((c for c in ["Tracking Number", "InvTrackingNumber", "Tracking"] if c in display_df.columns), None)
-if tracking_col:
-    display_df[tracking_col] = display_df[tracking_col].apply(normalize_tracking_number)
-
-# Format Net Charge Amount as currency for display.
-if "Net Charge Amount" in display_df.columns:
-    display_df["Net Charge Amount"] = display_df["Net Charge Amount"].apply(format_currency_display)
-
-# Move Classification before Match Type / Residential Match.
-classification_col = next((c for c in ["Classification", "classification"] if c in display_df.columns), None)
-match_type_col = next(
-    (c for c in ["Match Type", "MatchType", "Residential Match"] if c in display_df.columns),
-    None,
-)
-if classification_col and match_type_col and classification_col != match_type_col:
-    cols = list(display_df.columns)
-    cols.remove(classification_col)
-    match_idx = cols.index(match_type_col)
-    cols.insert(match_idx, classification_col)
-    display_df = display_df[cols]
+    # Move Classification before Match Type / Residential Match.
+    classification_col = next((c for c in ["Classification", "classification"] if c in display_df.columns), None)
+    match_type_col = next(
+        (c for c in ["Match Type", "MatchType", "Residential Match"] if c in display_df.columns),
+        None,
+    )
+    if classification_col and match_type_col and classification_col != match_type_col:
+        cols = list(display_df.columns)
+        cols.remove(classification_col)
+        match_idx = cols.index(match_type_col)
+        cols.insert(match_idx, classification_col)
+        display_df = display_df[cols]
+
+    return df, display_df
+
+
+df, display_df = prepare_results(RESULTS_CSV_FILE, results_mtime_ns)
+LOGGER.info("Prepared FedEx results rows=%s from %s", len(df), RESULTS_CSV_FILE)
+
+if df.empty:
+    LOGGER.info("No undisputed FedEx results in %s", RESULTS_CSV_FILE)
+    st.info("No results available.")
+    st.stop()
 
 # ============================================================
 # FILTERS
@@ -375,27 +490,37 @@ with st.expander("Filters", expanded=True):
         None,
     )
 
+    # Options and filter masks share the same decoded arrays.
+    filter_columns = get_filter_columns(
+        display_df[[c for c in ("Residential Match", state_col, service_col) if c]]
+    )
+
     left_col, right_col = st.columns(2)
     with left_col:
         status_filter = st.multiselect(
             "Residential Match",
-            sorted(display_df["Residential Match"].dropna().astype(str).unique().tolist()),
+            filter_columns["Residential Match"][0],
         )
-        state_options = sorted(display_df[state_col].dropna().astype(str).unique().tolist()) if state_col else []
+        state_options = filter_columns[state_col][0] if state_col else []
         state_filter = st.multiselect("State", state_options, disabled=state_col is None)
 
     with right_col:
         if invoice_date_col:
-            invoice_dates = pd.to_datetime(df[invoice_date_col], errors="coerce").dropna()
-            if invoice_dates.empty:
+            # InvoiceDate was rendered as mm/dd/yyyy above; other spellings come through as-is.
+            invoice_dt = parse_invoice_dates(
+                display_df[invoice_date_col],
+                "%m/%d/%Y" if invoice_date_col == "InvoiceDate" else None,
+            )
+            invoice_dates = invoice_dt[~np.isnat(invoice_dt)]
+            if invoice_dates.size == 0:
                 invoice_date_range = st.date_input(
                     "Invoice Date",
                     disabled=True,
                     help="No valid invoice dates found in data.",
                 )
             else:
-                min_date = invoice_dates.min().date()
-                max_date = invoice_dates.max().date()
+                min_date = invoice_dates.min().item()
+                max_date = invoice_dates.max().item()
                 invoice_date_range = st.date_input(
                     "Invoice Date",
                     value=(min_date, max_date),
@@ -408,26 +533,49 @@ with st.expander("Filters", expanded=True):
                 disabled=True,
                 help="Invoice Date column not found.",
             )
-        service_options = sorted(display_df[service_col].dropna().astype(str).unique().tolist()) if service_col else []
+        service_options = filter_columns[service_col][0] if service_col else []
         service_filter = st.multiselect("Service Type", service_options, disabled=service_col is None)
 
-view_df = display_df
-if state_filter and state_col:
-    view_df = view_df[view_df[state_col].fillna("").astype(str).isin(state_filter)]
-if service_filter and service_col:
-    view_df = view_df[view_df[service_col].fillna("").astype(str).isin(service_filter)]
-if invoice_date_col:
-    if isinstance(invoice_date_range, (tuple, list)) and len(invoice_date_range) == 2:
-        start_date, end_date = invoice_date_range
-    else:
-        start_date = invoice_date_range
-        end_date = invoice_date_range
+# Checkbox edits in the table rerun the page without touching the filters, so the
+# filtered view is reused until a filter or the results file changes.
+filter_key = (
+    tuple(state_filter),
+    tuple(service_filter),
+    tuple(status_filter),
+    tuple(invoice_date_range) if isinstance(invoice_date_range, (tuple, list)) else invoice_date_range,
+    results_mtime_ns,
+    len(display_df),
+)
+
+if st.session_state.get("filter_key") == filter_key:
+    view_df = st.session_state.filtered_view_df
+    view_positions = st.session_state.filtered_view_positions
+else:
+    filter_mask = np.ones(len(display_df), dtype=bool)
+    if state_filter and state_col:
+        filter_mask &= np.isin(filter_columns[state_col][1], state_filter)
+    if service_filter and service_col:
+        filter_mask &= np.isin(filter_columns[service_col][1], service_filter)
+    if invoice_date_col:
+        if isinstance(invoice_date_range, (tuple, list)) and len(invoice_date_range) == 2:
+            start_date, end_date = invoice_date_range
+        else:
+            start_date = invoice_date_range
+            end_date = invoice_date_range
+
+        if start_date and end_date:
+            # NaT compares False, so unparseable dates drop out as before.
+            filter_mask &= (invoice_dt >= np.datetime64(start_date, "D")) & (invoice_dt <= np.datetime64(end_date, "D"))
+    if status_filter:
+        filter_mask &= np.isin(filter_columns["Residential Match"][1], status_filter)
 
-    if start_date and end_date:
-        invoice_dates = pd.to_datetime(view_df[invoice_date_col], errors="coerce").dt.date
-        view_df = view_df[(invoice_dates >= start_date) & (invoice_dates <= end_date)]
-if status_filter:
-    view_df = view_df[view_df["Residential Match"].isin(status_filter)]
+    # All filters are combined first so the wide frame is gathered only once.
+    # display_df keeps df's row order, so these positions also index into df.
+    view_positions = np.flatnonzero(filter_mask)
+    view_df = display_df.iloc[view_positions]
+    st.session_state.filter_key = filter_key
+    st.session_state.filtered_view_df = view_df
+    st.session_state.filtered_view_positions = view_positions
 
 
 # ============================================================
@@ -436,14 +584,26 @@ if status_filter:
 if "select_all" not in st.session_state:
     st.session_state.select_all = False
 
-if "editor_df" not in st.session_state:
-    st.session_state.editor_df = None
+if "select_vec" not in st.session_state:
+    st.session_state.select_vec = None
+    st.session_state.select_index = None
 if "apply_select_all" not in st.session_state:
     st.session_state.apply_select_all = False
+# Bumped whenever Select is rewritten outside the editor so stale checkbox edits
+# held by the previous editor widget are not replayed on top.
+if "editor_generation" not in st.session_state:
+    st.session_state.editor_generation = 0
 
 # ============================================================
 # TOGGLE SELECT / SEND EMAIL BUTTONS
 # ============================================================
+def toggle_select_all() -> None:
+    # Runs before the click's rerun, so the label below already reflects the new state.
+    st.session_state.select_all = not st.session_state.select_all
+    st.session_state.apply_select_all = True
+    st.session_state.editor_generation += 1
+
+
 col1, col2, col3, col4, col5 = st.columns([1.5, 5.1, 2.4, 2.6, 2.4], width="stretch")
 
 with col1:
@@ -453,10 +613,7 @@ with col1:
     else:
         button_label = "Select All ✅"
     
-    if st.button(button_label, key="toggle_select"):
-        st.session_state.select_all = not st.session_state.select_all
-        st.session_state.apply_select_all = True
-        st.rerun()
+    st.button(button_label, key="toggle_select", on_click=toggle_select_all)
 
 # col2 is empty spacer in the middle
 
@@ -476,56 +633,80 @@ with col5:
 # TABLE WITH CHECKBOX SELECTION
 # ============================================================
 
-# Build a stable display DF with a persisted Select column.
-base_df = view_df.copy()
-
-# Seed editor_df the first time, or when shape/columns change (filters, new data, etc.)
+# Only the Select vector is persisted; it is reseeded the first time, or when the
+# filtered rows change (filters, new data, etc.). The data columns always come from view_df.
 needs_reset = (
-    st.session_state.editor_df is None
-    or len(st.session_state.editor_df) != len(base_df)
-    or list(st.session_state.editor_df.columns) != (["Select"] + list(base_df.columns))
+    st.session_state.select_vec is None
+    or not st.session_state.select_index.equals(view_df.index)
 )
 
 if needs_reset:
-    seed_df = base_df.copy()
-    seed_df.insert(0, "Select", False)
-    st.session_state.editor_df = seed_df
+    st.session_state.select_vec = np.zeros(len(view_df), dtype=np.bool_)
+    st.session_state.select_index = view_df.index
+    st.session_state.editor_generation += 1
 
 # Apply Select All / Deselect All exactly once when user clicks the toggle button.
 if st.session_state.apply_select_all:
-    st.session_state.editor_df["Select"] = bool(st.session_state.select_all)
+    st.session_state.select_vec[:] = bool(st.session_state.select_all)
     st.session_state.apply_select_all = False
 
+# Only one page of rows goes to the editor; selections live in the full select_vec.
+page_count = max(1, -(-len(view_df) // EDITOR_PAGE_SIZE))
+page_no = 0
+if page_count > 1:
+    if st.session_state.get("editor_page", 1) > page_count:
+        st.session_state.editor_page = 1
+    page_no = int(
+        st.number_input(
+            f"Page (of {page_count}, {EDITOR_PAGE_SIZE} rows each)",
+            min_value=1,
+            max_value=page_count,
+            step=1,
+            key="editor_page",
+        )
+    ) - 1
+page_rows = slice(page_no * EDITOR_PAGE_SIZE, (page_no + 1) * EDITOR_PAGE_SIZE)
+page_view_df = view_df.iloc[page_rows]
+
+editor_df = pd.concat(
+    [
+        pd.DataFrame({"Select": st.session_state.select_vec[page_rows]}, index=page_view_df.index),
+        page_view_df,
+    ],
+    axis=1,
+)
+
 edited_df = st.data_editor(
-    st.session_state.editor_df,
+    editor_df,
     use_container_width=True,
     hide_index=True,
     height=700,
-    key="address_validation_editor",
+    key=f"address_validation_editor_{st.session_state.editor_generation}_{page_no}",
     column_config={
         "Select": st.column_config.CheckboxColumn(
             "Select",
             help="Select rows to include in the email",
         )
     },
-    disabled=[c for c in st.session_state.editor_df.columns if c != "Select"],
+    disabled=list(view_df.columns),
 )
 
 # Persist edits so selections survive reruns (button clicks cause reruns).
-st.session_state.editor_df = edited_df
+st.session_state.select_vec[page_rows] = edited_df["Select"].to_numpy(dtype=np.bool_)
 
 # If user manually changes any checkbox while select_all is True, drop select_all flag
 # (this prevents the UI label from lying).
-if st.session_state.select_all and edited_df["Select"].sum() != len(edited_df):
+if st.session_state.select_all and not st.session_state.select_vec.all():
     st.session_state.select_all = False
 
 # ============================================================
 # SELECTION EXTRACTION
 # ============================================================
-selected_mask = edited_df["Select"]
-selected_indices = edited_df.index[selected_mask]
-has_selection = len(selected_indices) > 0
-selected_rows_for_email = df.loc[selected_indices]
+# select_vec lines up with view_df, so selections map to df positions directly.
+selected_positions = view_positions[np.flatnonzero(st.session_state.select_vec)]
+selected_indices = df.index[selected_positions]
+has_selection = selected_positions.size > 0
+selected_rows_for_email = df.iloc[selected_positions]
 # ============================================================
 # ACTION BUTTONS (in right columns)
 # ============================================================
@@ -600,6 +781,7 @@ if mark_disputed_clicked:
         mark_rows_as_disputed(RESULTS_CSV_FILE, selected_indices.tolist())
         LOGGER.info("Marked rows as disputed | count=%s", len(selected_indices))
         load_results.clear()
+        prepare_results.clear()
         st.success("Selected rows marked as disputed.")
         st.rerun()
     except Exception as exc:
@@ -24,28 +24,11 @@ st.set_page_config(
     layout="wide",
 )
 
-# ============================================================
-# GLOBAL STYLING (MATCH TASK TRACKER — SAFE FOR SIDEBAR)
-# ============================================================
-
-st.markdown(utils.get_global_css(), unsafe_allow_html=True)
-
 # ============================================================
 # HEADER
 # ============================================================
 
-LOGO_PATH           = config.LOGO_PATH
-logo_b64 = utils.get_logo_base64(str(LOGO_PATH))
-
-st.markdown(
-    f"""
-    <div class="header-row">
-        <img class="header-logo" src="data:image/png;base64,{logo_b64}" />
-        <h1 class="header-title">Logistics Support App</h1>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+st.markdown(utils.get_page_header_html("Logistics Support App"), unsafe_allow_html=True)
 
 st.divider()
 
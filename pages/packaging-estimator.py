@@ -14,17 +14,26 @@ Workflow:
 
 from __future__ import annotations
 
-from decimal import Decimal, InvalidOperation
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 import hashlib
+import importlib.util
 import json
 import logging
 import math
 import os
+import re
+import threading
+import time
 from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 
 import config
@@ -34,18 +43,8 @@ import utils
 # PAGE CONFIG / HEADER
 # ============================================================
 st.set_page_config(page_title="Packaging Estimator", layout="wide")
-st.markdown(utils.get_global_css(), unsafe_allow_html=True)
-
-logo_b64 = utils.get_logo_base64(str(config.LOGO_PATH))
-st.markdown(
-    f"""
-    <div class="header-row">
-        <img class="header-logo" src="data:image/png;base64,{logo_b64}" />
-        <h1 class="header-title">LS - Packaging Estimator</h1>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+
+st.markdown(utils.get_page_header_html("LS - Packaging Estimator"), unsafe_allow_html=True)
 st.divider()
 
 
@@ -55,6 +54,20 @@ st.divider()
 INPUT_MODE_UPLOAD = "Upload Excel"
 INPUT_MODE_PASTE = "Paste from Excel (tab-separated)"
 
+# Largest quantity accepted per input row. Far above any real order, and small enough
+# that int64 sums over duplicate rows cannot overflow.
+MAX_ITEM_QUANTITY = 1_000_000_000
+
+# Separator for packed item-number cache keys (ASCII unit separator; never typed into input).
+ITEM_KEY_SEPARATOR = "\x1f"
+
+# Anything that is not a letter or digit (Unicode-aware, like str.isalnum).
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+# Whitespace stripped out of item numbers (the vectorized normalize_item_number).
+_WHITESPACE_RE = re.compile(r"\s+")
+
+VERIFICATION_FLAGS_SCHEMA = pa.schema([("ItemNumber", pa.string()), ("IsVerified", pa.bool_())])
+
 SUMMARY_COLUMNS = ["ItemNumber", "Quantity", "IsVerified"]
 PACKAGING_COLUMNS = [
     "PackageId",
@@ -87,6 +100,10 @@ def load_packaging_config() -> dict[str, Any]:
             "service_principal_client_secret_env": "AZURE_CLIENT_SECRET",
             "service_principal_scope": "https://analysis.windows.net/powerbi/api/.default",
             "timeout_seconds": 60,
+            "chunk_workers": 4,
+            # Relative paths resolve under LOG_BASE_DIR/<user>/cache; absolute paths are used as-is.
+            "flags_cache_dir": "verification_flags",
+            "flags_ttl_seconds": 86_400,
             "enable_mock": True,
         },
         "api": {
@@ -139,8 +156,58 @@ def get_page_logger() -> logging.Logger:
     )
 
 
+@dataclass(frozen=True)
+class UIDefaults:
+    warehouse: int
+    marginal_length: float
+    marginal_width: float
+    marginal_height: float
+
+
+@dataclass(frozen=True)
+class SSASSettings:
+    enable_mock: bool
+    connection: str
+    database: str
+    timeout_seconds: int
+    item_filter_chunk_size: int
+    chunk_workers: int
+    flags_cache_dir: str
+    flags_ttl_seconds: float
+    raw: dict[str, Any]  # full section, for the token/auth env lookups
+
+
+def build_ui_defaults(page_config: dict[str, Any]) -> UIDefaults:
+    ui_cfg = page_config.get("ui", {})
+    return UIDefaults(
+        warehouse=int(ui_cfg.get("default_warehouse", 105)),
+        marginal_length=float(ui_cfg.get("default_marginal_length", 0.0)),
+        marginal_width=float(ui_cfg.get("default_marginal_width", 0.0)),
+        marginal_height=float(ui_cfg.get("default_marginal_height", 0.0)),
+    )
+
+
+def build_ssas_settings(page_config: dict[str, Any]) -> SSASSettings:
+    ssas_cfg = page_config.get("ssas", {}) if isinstance(page_config.get("ssas"), dict) else {}
+    item_filter_chunk_size = int(ssas_cfg.get("item_filter_chunk_size", 1000) or 1000)
+    return SSASSettings(
+        enable_mock=bool(ssas_cfg.get("enable_mock", True)),
+        connection=str(ssas_cfg.get("connection", "")).strip(),
+        database=str(ssas_cfg.get("database", "")).strip(),
+        timeout_seconds=int(ssas_cfg.get("timeout_seconds", 60) or 60),
+        item_filter_chunk_size=item_filter_chunk_size if item_filter_chunk_size > 0 else 1000,
+        chunk_workers=int(ssas_cfg.get("chunk_workers", 4) or 1),
+        flags_cache_dir=str(ssas_cfg.get("flags_cache_dir", "") or "").strip(),
+        flags_ttl_seconds=float(ssas_cfg.get("flags_ttl_seconds", 86_400) or 0),
+        raw=ssas_cfg,
+    )
+
+
 LOGGER = get_page_logger()
 PAGE_CONFIG = load_packaging_config()
+# Config-derived settings, coerced once per run instead of inside each pipeline call.
+UI_DEFAULTS = build_ui_defaults(PAGE_CONFIG)
+SSAS_SETTINGS = build_ssas_settings(PAGE_CONFIG)
 LOGGER.info("Packaging Estimator page rendered.")
 
 
@@ -158,14 +225,47 @@ if "pe_errors" not in st.session_state:
 # ============================================================
 # INPUT HELPERS
 # ============================================================
-@st.cache_data
-def read_excel_bytes(file_bytes: bytes) -> pd.DataFrame:
-    """Read uploaded Excel bytes into a DataFrame."""
-    return pd.read_excel(BytesIO(file_bytes), dtype=str)
+# python-calamine (Rust) reads both .xlsx and .xls from cached cell values; openpyxl is
+# only the fallback for environments that have not picked up the new requirement yet.
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+
+def _hash_upload_bytes(file_bytes: bytes) -> str:
+    return hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+
+UPLOAD_PEEK_ROWS = 200
+
+
+def read_excel_bytes(
+    file_bytes: bytes,
+    nrows: int | None = None,
+    usecols: list[int] | None = None,
+) -> pd.DataFrame:
+    """Read the first sheet of uploaded Excel bytes into a DataFrame."""
+    return pd.read_excel(
+        BytesIO(file_bytes),
+        sheet_name=0,
+        engine=EXCEL_ENGINE,
+        nrows=nrows,
+        usecols=usecols,
+    )
+
+
+def _excel_cell_text(value: Any) -> str:
+    # Integral numeric cells read back as float when a column has blanks; keep "123", not "123.0".
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def excel_column_as_text(values: pd.Series) -> pd.Series:
+    """Coerce one uploaded column to text, leaving blanks as NaN."""
+    return values.map(_excel_cell_text, na_action="ignore")
 
 
 def normalize_col_name(col_name: str) -> str:
-    return "".join(ch for ch in str(col_name).lower() if ch.isalnum())
+    return _NON_ALNUM_RE.sub("", str(col_name).lower())
 
 
 def find_default_column(columns: list[str], targets: set[str], fallback_index: int) -> int:
@@ -176,6 +276,56 @@ def find_default_column(columns: list[str], targets: set[str], fallback_index: i
     return min(fallback_index, max(0, len(columns) - 1))
 
 
+@st.cache_data(ttl=1800, max_entries=8, show_spinner=False, hash_funcs={bytes: _hash_upload_bytes})
+def peek_upload(file_bytes: bytes) -> tuple[pd.DataFrame, list[str], int, int]:
+    """
+    Read the header and first rows of an upload and infer its default item/quantity columns.
+
+    Only UPLOAD_PEEK_ROWS rows are parsed; the full sheet is read by load_upload_rows on Load.
+    """
+    uploaded_df = read_excel_bytes(file_bytes, nrows=UPLOAD_PEEK_ROWS)
+    uploaded_df.columns = [str(col).strip() for col in uploaded_df.columns]
+    upload_columns = uploaded_df.columns.tolist()
+    default_item_idx = find_default_column(
+        columns=upload_columns,
+        targets={"itemnumber", "item", "itemno", "sku"},
+        fallback_index=0,
+    )
+    default_qty_idx = find_default_column(
+        columns=upload_columns,
+        targets={"quantity", "qty"},
+        fallback_index=1,
+    )
+    if default_qty_idx == default_item_idx and len(upload_columns) > 1:
+        default_qty_idx = 1 if default_item_idx == 0 else 0
+    return uploaded_df, upload_columns, default_item_idx, default_qty_idx
+
+
+def build_upload_input(uploaded_df: pd.DataFrame, item_column: Any, qty_column: Any) -> pd.DataFrame:
+    # Built straight from arrays: no block copy of the upload, and Excel row numbers
+    # (header is row 1) as int32.
+    return pd.DataFrame(
+        {
+            "ItemNumber": excel_column_as_text(uploaded_df[item_column]).to_numpy(),
+            "Quantity": excel_column_as_text(uploaded_df[qty_column]).to_numpy(),
+            "_RowNumber": np.arange(2, len(uploaded_df) + 2, dtype=np.int32),
+        }
+    )
+
+
+@st.cache_data(ttl=1800, max_entries=8, show_spinner=False, hash_funcs={bytes: _hash_upload_bytes})
+def load_upload_rows(file_bytes: bytes, item_position: int, qty_position: int) -> pd.DataFrame:
+    """Read every row of the two selected upload columns (by sheet position)."""
+    positions = sorted({item_position, qty_position})
+    uploaded_df = read_excel_bytes(file_bytes, usecols=positions)
+    column_by_position = dict(zip(positions, uploaded_df.columns))
+    return build_upload_input(
+        uploaded_df,
+        column_by_position[item_position],
+        column_by_position[qty_position],
+    )
+
+
 def normalize_item_number(value: Any) -> str:
     if value is None:
         return ""
@@ -184,93 +334,91 @@ def normalize_item_number(value: Any) -> str:
     return "".join(str(value).split()).upper()
 
 
-def parse_quantity(value: Any) -> int | None:
-    if value is None:
-        return None
-    if isinstance(value, float) and pd.isna(value):
-        return None
-
-    text = str(value).strip().replace(",", "")
-    if not text:
-        return None
-
-    try:
-        quantity_decimal = Decimal(text)
-    except (InvalidOperation, ValueError):
-        return None
-
-    if quantity_decimal != quantity_decimal.to_integral_value():
-        return None
-
-    quantity = int(quantity_decimal)
-    if quantity <= 0:
-        return None
-    return quantity
-
-
 def parse_pasted_input(raw_text: str) -> tuple[pd.DataFrame, list[str]]:
     """Parse tab-separated pasted rows into a standard input DataFrame."""
-    errors: list[str] = []
-    records: list[dict[str, Any]] = []
-    lines = raw_text.splitlines()
-
-    for line_number, line in enumerate(lines, start=1):
-        if not line.strip():
-            continue
-
-        parts = line.split("\t")
-        if len(parts) < 2:
-            errors.append(
-                f"Line {line_number}: expected tab-separated values ItemNumber<TAB>Quantity."
-            )
-            continue
-
-        records.append(
-            {
-                "ItemNumber": parts[0],
-                "Quantity": parts[1],
-                "_RowNumber": line_number,
-            }
-        )
-
-    if not records:
-        return pd.DataFrame(columns=["ItemNumber", "Quantity", "_RowNumber"]), errors
-    return pd.DataFrame(records), errors
+    empty_df = pd.DataFrame(columns=["ItemNumber", "Quantity", "_RowNumber"])
+    lines = pd.Series(raw_text.splitlines(), dtype=object)
+    lines.index += 1  # 1-based line numbers for error messages
+    lines = lines[lines.str.strip().ne("")]
+    if lines.empty:
+        return empty_df, []
+
+    has_tab = lines.str.contains("\t", regex=False)
+    errors = [
+        f"Line {line_number}: expected tab-separated values ItemNumber<TAB>Quantity."
+        for line_number in lines.index[~has_tab]
+    ]
+    if not has_tab.any():
+        return empty_df, errors
+
+    parts = lines[has_tab].str.split("\t", n=2, expand=True)
+    parsed_df = pd.DataFrame(
+        {
+            "ItemNumber": parts[0].to_numpy(),
+            "Quantity": parts[1].to_numpy(),
+            "_RowNumber": parts.index.to_numpy(),
+        }
+    )
+    return parsed_df, errors
 
 
 def validate_and_aggregate_rows(input_df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
     """
     Validate rows against business rules and aggregate duplicates by ItemNumber.
     """
-    errors: list[str] = []
-    valid_rows: list[dict[str, Any]] = []
-
-    for idx, row in input_df.reset_index(drop=True).iterrows():
-        row_number = int(row.get("_RowNumber", idx + 1))
-        item_number = normalize_item_number(row.get("ItemNumber"))
-        quantity = parse_quantity(row.get("Quantity"))
+    if input_df.empty:
+        return pd.DataFrame(columns=["ItemNumber", "Quantity"]), []
+
+    item_raw = input_df["ItemNumber"]
+    qty_raw = input_df["Quantity"]
+    row_numbers = (
+        input_df["_RowNumber"]
+        if "_RowNumber" in input_df.columns
+        else pd.Series(range(1, len(input_df) + 1), index=input_df.index)
+    )
 
-        if not item_number:
-            errors.append(f"Row {row_number}: ItemNumber is blank.")
-            continue
-        if quantity is None:
-            errors.append(
-                f"Row {row_number}: Quantity '{row.get('Quantity')}' is invalid (must be integer > 0)."
-            )
-            continue
+    # ItemNumber: whitespace removed, upper-cased (same as normalize_item_number).
+    items = (
+        item_raw.astype(object).where(item_raw.notna(), "").astype(str)
+        .str.replace(_WHITESPACE_RE, "", regex=True)
+        .str.upper()
+    )
+    # Quantity: thousands separators allowed, must be a whole number in 1..MAX_ITEM_QUANTITY.
+    qty_text = (
+        qty_raw.astype(object).where(qty_raw.notna(), "").astype(str)
+        .str.strip()
+        .str.replace(",", "", regex=False)
+    )
+    quantities = pd.to_numeric(qty_text, errors="coerce")
 
-        valid_rows.append({"ItemNumber": item_number, "Quantity": quantity})
+    blank_item = items.eq("")
+    # Out-of-range values are rejected before the int64 cast below, which would overflow.
+    bad_qty = ~blank_item & (
+        quantities.isna() | (quantities % 1 != 0) | (quantities <= 0) | (quantities > MAX_ITEM_QUANTITY)
+    )
+    rejected = blank_item | bad_qty
+
+    errors = [
+        f"Row {int(row_number)}: ItemNumber is blank."
+        if is_blank
+        else f"Row {int(row_number)}: Quantity '{raw}' is invalid (must be integer from 1 to {MAX_ITEM_QUANTITY:,})."
+        for row_number, raw, is_blank in zip(
+            row_numbers[rejected].to_numpy(),
+            qty_raw[rejected].to_numpy(),
+            blank_item[rejected].to_numpy(),
+        )
+    ]
 
-    if not valid_rows:
+    if rejected.all():
         return pd.DataFrame(columns=["ItemNumber", "Quantity"]), errors
 
     clean_df = (
-        pd.DataFrame(valid_rows)
-        .groupby("ItemNumber", as_index=False)["Quantity"]
+        pd.DataFrame({"ItemNumber": items[~rejected], "Quantity": quantities[~rejected].astype("int64")})
+        .groupby("ItemNumber", as_index=False, sort=True)["Quantity"]
         .sum()
-        .sort_values("ItemNumber")
-        .reset_index(drop=True)
     )
+    # Positive counts; consumers that pack or serialize quantities cast back to int64 explicitly.
+    clean_df["Quantity"] = pd.to_numeric(clean_df["Quantity"], downcast="unsigned")
     return clean_df, errors
 
 
@@ -285,19 +433,24 @@ def _mock_verification_flags(items: list[str]) -> dict[str, bool]:
     return flags
 
 
+_TRUTHY_SSAS_FLAGS = frozenset({"1", "true", "t", "yes", "y"})
+
+
 def _coerce_ssas_flag(value: Any) -> bool:
-    if value is None or type(value).__name__ == "DBNull":
+    # ADOMD mostly hands back bool/int; only fall back to string parsing for other types.
+    if value is True:
+        return True
+    if value is False or value is None:
         return False
-    if isinstance(value, bool):
-        return value
     if isinstance(value, (int, float, Decimal)):
-        return bool(value)
-    normalized = str(value).strip().lower()
-    return normalized in {"1", "true", "t", "yes", "y"}
+        return value != 0
+    if type(value).__name__ == "DBNull":
+        return False
+    return str(value).strip().lower() in _TRUTHY_SSAS_FLAGS
 
 
 def _normalize_field_name(field_name: str) -> str:
-    return "".join(ch for ch in str(field_name).lower() if ch.isalnum())
+    return _NON_ALNUM_RE.sub("", str(field_name).lower())
 
 
 def _extract_ssas_column_name(description_item: Any) -> str:
@@ -317,29 +470,26 @@ def _extract_ssas_column_name(description_item: Any) -> str:
 def _resolve_ssas_field_ordinals(description: Any) -> tuple[int, int]:
     item_exact = {"itemnumber", "__itemnumber"}
     verified_exact = {"isverified", "verified", "__isverified"}
-    item_contains = {"itemnumber"}
-    verified_contains = {"isverified", "verified"}
-    item_ordinal = -1
-    verified_ordinal = -1
-    columns = list(description or [])
-
-    for idx, column in enumerate(columns):
-        normalized_name = _normalize_field_name(_extract_ssas_column_name(column))
-        if item_ordinal < 0 and normalized_name in item_exact:
-            item_ordinal = idx
-        if verified_ordinal < 0 and normalized_name in verified_exact:
-            verified_ordinal = idx
-
-    if item_ordinal >= 0 and verified_ordinal >= 0:
-        return item_ordinal, verified_ordinal
+    item_exact_ordinal = -1
+    verified_exact_ordinal = -1
+    item_contains_ordinal = -1
+    verified_contains_ordinal = -1
 
-    for idx, column in enumerate(columns):
+    for idx, column in enumerate(description or []):
         normalized_name = _normalize_field_name(_extract_ssas_column_name(column))
-        if item_ordinal < 0 and any(token in normalized_name for token in item_contains):
-            item_ordinal = idx
-        if verified_ordinal < 0 and any(token in normalized_name for token in verified_contains):
-            verified_ordinal = idx
-
+        if item_exact_ordinal < 0 and normalized_name in item_exact:
+            item_exact_ordinal = idx
+        if verified_exact_ordinal < 0 and normalized_name in verified_exact:
+            verified_exact_ordinal = idx
+        if item_exact_ordinal >= 0 and verified_exact_ordinal >= 0:
+            break
+        if item_contains_ordinal < 0 and "itemnumber" in normalized_name:
+            item_contains_ordinal = idx
+        if verified_contains_ordinal < 0 and "verified" in normalized_name:
+            verified_contains_ordinal = idx
+
+    item_ordinal = item_exact_ordinal if item_exact_ordinal >= 0 else item_contains_ordinal
+    verified_ordinal = verified_exact_ordinal if verified_exact_ordinal >= 0 else verified_contains_ordinal
     if item_ordinal < 0 or verified_ordinal < 0:
         raise ValueError(
             "Could not detect ItemNumber/IsVerified columns in SSAS query result."
@@ -392,12 +542,12 @@ def _is_adomd_unknown_response(exc: Exception) -> bool:
     )
 
 
-def _acquire_service_principal_token(
-    tenant_id: str,
-    client_id: str,
-    client_secret: str,
-    scope: str,
-) -> str:
+@st.cache_resource(show_spinner=False)
+def _get_msal_app(tenant_id: str, client_id: str, client_secret: str) -> Any:
+    """
+    One MSAL confidential client per credential set, kept across reruns so its
+    in-memory token cache survives and unexpired tokens are reused.
+    """
     try:
         import msal  # type: ignore
     except Exception as exc:
@@ -406,11 +556,21 @@ def _acquire_service_principal_token(
         ) from exc
 
     authority = f"https://login.microsoftonline.com/{tenant_id}"
-    app = msal.ConfidentialClientApplication(
+    return msal.ConfidentialClientApplication(
         client_id=client_id,
         authority=authority,
         client_credential=client_secret,
     )
+
+
+def _acquire_service_principal_token(
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+    scope: str,
+) -> str:
+    app = _get_msal_app(tenant_id, client_id, client_secret)
+    # Served from the app's token cache until the token nears expiry.
     result = app.acquire_token_for_client(scopes=[scope])
     access_token = str(result.get("access_token", "")).strip()
     if access_token:
@@ -492,34 +652,141 @@ def _iter_pyadomd_rows(cursor: Any) -> Any:
             yield row
 
 
+def _merge_ssas_flags(
+    flags: dict[str, bool],
+    requested_items: set[str],
+    raw_items: list[Any],
+    raw_flags: list[Any],
+) -> int:
+    """Fold one chunk's (ItemNumber, IsVerified) values into flags; returns matched row count."""
+    if not raw_items:
+        return 0
+    items = pd.Series(raw_items, dtype=object)
+    items = (
+        items.where(items.notna(), "").astype(str)
+        .str.replace(_WHITESPACE_RE, "", regex=True)
+        .str.upper()
+    )
+    coerce_flags = np.frompyfunc(_coerce_ssas_flag, 1, 1)
+    verified = pd.Series(
+        coerce_flags(np.asarray(raw_flags, dtype=object)).astype(bool),
+        index=pd.Index(items),
+    )
+    verified = verified[items.isin(requested_items).to_numpy()]
+    for item, is_verified in verified.groupby(level=0).any().items():
+        flags[item] = flags[item] or bool(is_verified)
+    return len(verified)
+
+
+def _close_shared_ssas_connection(shared: tuple[Any, threading.Lock]) -> None:
+    conn, _ = shared
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+@st.cache_resource(show_spinner=False, max_entries=2, on_release=_close_shared_ssas_connection)
+def _get_shared_ssas_connection(connection_string: str) -> tuple[Any, threading.Lock]:
+    """
+    Open ADOMD connection reused across pipeline runs, keyed by connection string
+    (a refreshed access token yields a new entry). Callers hold the lock while using
+    it because sessions run on separate threads.
+    """
+    from pyadomd import Pyadomd  # type: ignore
+
+    conn = Pyadomd(connection_string)
+    conn.open()
+    return conn, threading.Lock()
+
+
+def _read_ssas_chunk(
+    conn: Any,
+    item_chunk: list[str],
+    chunk_number: int,
+    chunk_count: int,
+) -> tuple[list[Any], list[Any]]:
+    """Run the verification query for one item chunk; returns raw (items, flags) columns."""
+    query = _build_verification_query(item_chunk)
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()[:12]
+
+    cursor = conn.cursor()
+    try:
+        LOGGER.info(
+            "SSAS executing chunk query via pyadomd | chunk=%s/%s items=%s query_hash=%s",
+            chunk_number,
+            chunk_count,
+            len(item_chunk),
+            query_hash,
+        )
+        cursor.execute(query)
+        item_ordinal, verified_ordinal = _resolve_ssas_field_ordinals(
+            getattr(cursor, "description", [])
+        )
+
+        # The reader is drained into plain lists; normalization and the
+        # flag merge then run column-wise once per chunk.
+        chunk_items: list[Any] = []
+        chunk_flags: list[Any] = []
+        try:
+            for row in _iter_pyadomd_rows(cursor):
+                chunk_items.append(row[item_ordinal])
+                chunk_flags.append(row[verified_ordinal])
+        except Exception as exc:
+            if _is_adomd_unknown_response(exc) and chunk_items:
+                LOGGER.warning(
+                    "SSAS ADOMD reader ended with unknown response after %s rows in chunk %s/%s. "
+                    "Treating as end-of-result for this chunk.",
+                    len(chunk_items),
+                    chunk_number,
+                    chunk_count,
+                )
+            else:
+                raise
+        return chunk_items, chunk_flags
+    finally:
+        close_fn = getattr(cursor, "close", None)
+        if callable(close_fn):
+            try:
+                close_fn()
+            except Exception:
+                pass
+
+
+def _ssas_lookup_configured() -> bool:
+    """True when verification flags come from a live SSAS query rather than the mock path."""
+    ssas = SSAS_SETTINGS
+    return not ssas.enable_mock and bool(ssas.connection) and bool(ssas.database)
+
+
 def fetch_verification_flags(items: list[str]) -> dict[str, bool]:
     """
     Execute configured SSAS DAX query via pyadomd and map results back
-    to requested item flags.
+    to requested item flags. Mock mode and incomplete configuration return the
+    deterministic flags; a failed SSAS lookup raises so the caller can fall back.
     """
     normalized_items = [normalize_item_number(item) for item in items]
     unique_items = [item for item in dict.fromkeys(normalized_items) if item]
     if not unique_items:
         return {}
 
-    ssas_cfg = PAGE_CONFIG.get("ssas", {}) if isinstance(PAGE_CONFIG.get("ssas"), dict) else {}
-    item_filter_chunk_size = int(ssas_cfg.get("item_filter_chunk_size", 1000) or 1000)
-    if item_filter_chunk_size <= 0:
-        item_filter_chunk_size = 1000
+    ssas = SSAS_SETTINGS
+    item_filter_chunk_size = ssas.item_filter_chunk_size
     LOGGER.info(
         "SSAS verification start | requested_items=%s enable_mock=%s item_filter_chunk_size=%s",
         len(unique_items),
-        bool(ssas_cfg.get("enable_mock", True)),
+        ssas.enable_mock,
         item_filter_chunk_size,
     )
-    if bool(ssas_cfg.get("enable_mock", True)):
+    if ssas.enable_mock:
         LOGGER.info("SSAS verification using mock path (enable_mock=true).")
         return _mock_verification_flags(unique_items)
 
-    connection = str(ssas_cfg.get("connection", "")).strip()
-    database = str(ssas_cfg.get("database", "")).strip()
-    timeout_seconds = int(ssas_cfg.get("timeout_seconds", 60) or 60)
-    access_token, token_source = _resolve_ssas_access_token(ssas_cfg)
+    connection = ssas.connection
+    database = ssas.database
+    timeout_seconds = ssas.timeout_seconds
+    chunk_workers = ssas.chunk_workers
+    access_token, token_source = _resolve_ssas_access_token(ssas.raw)
 
     if not connection or not database:
         LOGGER.warning(
@@ -546,12 +813,13 @@ def fetch_verification_flags(items: list[str]) -> dict[str, bool]:
 
     try:
         LOGGER.info(
-            "SSAS opening pyadomd connection | database=%s timeout=%s token_source=%s token_present=%s chunks=%s",
+            "SSAS opening pyadomd connection | database=%s timeout=%s token_source=%s token_present=%s chunks=%s workers=%s",
             database,
             timeout_seconds,
             token_source,
             bool(access_token),
             chunk_count,
+            min(max(chunk_workers, 1), chunk_count),
         )
         try:
             from pyadomd import Pyadomd  # type: ignore
@@ -560,58 +828,70 @@ def fetch_verification_flags(items: list[str]) -> dict[str, bool]:
                 "pyadomd is not installed or failed to import. Install dependency 'pyadomd'."
             ) from exc
 
+        item_chunks = [
+            unique_items[chunk_index : chunk_index + item_filter_chunk_size]
+            for chunk_index in range(0, len(unique_items), item_filter_chunk_size)
+        ]
+        chunk_results: list[tuple[list[Any], list[Any]]] | None = None
+
+        if chunk_workers > 1 and chunk_count > 1:
+            # ADOMD connections are not thread-safe, so each worker thread opens one
+            # and reuses it for every chunk it picks up.
+            worker_state = threading.local()
+            worker_conns: list[Any] = []
+            worker_conns_lock = threading.Lock()
+
+            def read_chunk_on_worker_connection(chunk_number: int) -> tuple[list[Any], list[Any]]:
+                worker_conn = getattr(worker_state, "conn", None)
+                if worker_conn is None:
+                    worker_conn = Pyadomd(connection_string)
+                    worker_conn.open()
+                    worker_state.conn = worker_conn
+                    with worker_conns_lock:
+                        worker_conns.append(worker_conn)
+                return _read_ssas_chunk(worker_conn, item_chunks[chunk_number - 1], chunk_number, chunk_count)
+
+            try:
+                with ThreadPoolExecutor(max_workers=min(chunk_workers, chunk_count)) as executor:
+                    chunk_results = list(executor.map(read_chunk_on_worker_connection, range(1, chunk_count + 1)))
+            except Exception as exc:
+                LOGGER.warning("SSAS parallel chunk queries failed; retrying serially: %s", exc)
+                chunk_results = None
+            finally:
+                # The pool has shut down here, so no worker is still using a connection.
+                for worker_conn in worker_conns:
+                    try:
+                        worker_conn.close()
+                    except Exception:
+                        pass
+
+        if chunk_results is None:
+            def read_chunks_on_shared_connection() -> list[tuple[list[Any], list[Any]]]:
+                conn, conn_lock = _get_shared_ssas_connection(connection_string)
+                with conn_lock:
+                    return [
+                        _read_ssas_chunk(conn, item_chunk, chunk_number, chunk_count)
+                        for chunk_number, item_chunk in enumerate(item_chunks, start=1)
+                    ]
+
+            try:
+                chunk_results = read_chunks_on_shared_connection()
+            except Exception as exc:
+                # The cached connection may have gone idle/stale: drop it and retry once
+                # on a freshly opened one before giving up on SSAS.
+                LOGGER.warning("SSAS shared connection failed; reconnecting once: %s", exc)
+                _get_shared_ssas_connection.clear(connection_string)
+                try:
+                    chunk_results = read_chunks_on_shared_connection()
+                except Exception:
+                    _get_shared_ssas_connection.clear(connection_string)
+                    raise
+
         rows_read = 0
         matched_items = 0
-        with Pyadomd(connection_string) as conn:
-            for chunk_index in range(0, len(unique_items), item_filter_chunk_size):
-                item_chunk = unique_items[chunk_index : chunk_index + item_filter_chunk_size]
-                query = _build_verification_query(item_chunk)
-                query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()[:12]
-                requested_items = set(item_chunk)
-
-                cursor = conn.cursor()
-                try:
-                    LOGGER.info(
-                        "SSAS executing chunk query via pyadomd | chunk=%s/%s items=%s query_hash=%s",
-                        (chunk_index // item_filter_chunk_size) + 1,
-                        chunk_count,
-                        len(item_chunk),
-                        query_hash,
-                    )
-                    cursor.execute(query)
-                    item_ordinal, verified_ordinal = _resolve_ssas_field_ordinals(
-                        getattr(cursor, "description", [])
-                    )
-
-                    chunk_rows = 0
-                    try:
-                        for row in _iter_pyadomd_rows(cursor):
-                            chunk_rows += 1
-                            rows_read += 1
-                            item_value = normalize_item_number(row[item_ordinal])
-                            if item_value in requested_items:
-                                matched_items += 1
-                                flags[item_value] = flags[item_value] or _coerce_ssas_flag(
-                                    row[verified_ordinal]
-                                )
-                    except Exception as exc:
-                        if _is_adomd_unknown_response(exc) and chunk_rows > 0:
-                            LOGGER.warning(
-                                "SSAS ADOMD reader ended with unknown response after %s rows in chunk %s/%s. "
-                                "Treating as end-of-result for this chunk.",
-                                chunk_rows,
-                                (chunk_index // item_filter_chunk_size) + 1,
-                                chunk_count,
-                            )
-                        else:
-                            raise
-                finally:
-                    close_fn = getattr(cursor, "close", None)
-                    if callable(close_fn):
-                        try:
-                            close_fn()
-                        except Exception:
-                            pass
+        for item_chunk, (chunk_items, chunk_flags) in zip(item_chunks, chunk_results):
+            rows_read += len(chunk_items)
+            matched_items += _merge_ssas_flags(flags, set(item_chunk), chunk_items, chunk_flags)
 
         verified_true = sum(1 for v in flags.values() if v)
         LOGGER.info(
@@ -622,35 +902,101 @@ def fetch_verification_flags(items: list[str]) -> dict[str, bool]:
             len(unique_items),
         )
     except Exception as exc:
-        LOGGER.exception("SSAS verification lookup failed. Falling back to deterministic verification: %s", exc)
-        return _mock_verification_flags(unique_items)
+        LOGGER.exception("SSAS verification lookup failed: %s", exc)
+        raise
 
     return flags
 
 
+def _verification_flags_cache_path(items_key: tuple[str, ...]) -> Path | None:
+    if not SSAS_SETTINGS.flags_cache_dir:
+        return None
+    cache_dir = Path(SSAS_SETTINGS.flags_cache_dir)
+    if not cache_dir.is_absolute():
+        # Never relative to the working directory, which is usually the app checkout.
+        try:
+            cache_dir = utils.get_user_cache_dir(str(cache_dir))
+        except OSError as exc:
+            LOGGER.warning("Verification disk cache disabled; cache dir unavailable: %s", exc)
+            return None
+    key = hashlib.sha256(ITEM_KEY_SEPARATOR.join(sorted(items_key)).encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.parquet"
+
+
 @st.cache_data(show_spinner=False)
-def fetch_verification_flags_cached(items_key: tuple[str, ...]) -> dict[str, bool]:
-    """Cached wrapper for SSAS placeholder call keyed by normalized item tuple."""
-    return fetch_verification_flags(list(items_key))
+def _fetch_verification_flags_cached(items_key: tuple[str, ...]) -> dict[str, bool]:
+    """
+    Cached verification lookup keyed by normalized item tuple. Live SSAS results are
+    also kept on disk (one parquet per item set, expiring after ssas.flags_ttl_seconds)
+    so app restarts do not repeat the lookup. A failed SSAS lookup raises, and
+    st.cache_data does not cache exceptions.
+    """
+    ttl_seconds = SSAS_SETTINGS.flags_ttl_seconds
+    cache_path = (
+        _verification_flags_cache_path(items_key)
+        if ttl_seconds > 0 and _ssas_lookup_configured()
+        else None
+    )
+
+    if cache_path is not None:
+        try:
+            if cache_path.exists() and time.time() - cache_path.stat().st_mtime < ttl_seconds:
+                cached_df = pd.read_parquet(cache_path)
+                LOGGER.info("SSAS verification served from disk cache | items=%s", len(cached_df))
+                return dict(zip(cached_df["ItemNumber"], cached_df["IsVerified"].astype(bool)))
+        except Exception as exc:
+            LOGGER.warning("Ignoring unreadable verification cache %s: %s", cache_path, exc)
 
+    flags = fetch_verification_flags(list(items_key))
+    if cache_path is not None:
+        try:
+            utils.atomic_write_parquet(
+                pd.DataFrame({"ItemNumber": list(flags.keys()), "IsVerified": list(flags.values())}),
+                cache_path,
+                schema=VERIFICATION_FLAGS_SCHEMA,
+            )
+        except Exception as exc:
+            LOGGER.warning("Could not write verification cache %s: %s", cache_path, exc)
+    return flags
 
-def add_verification_flags(clean_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    items_key = tuple(clean_df["ItemNumber"].tolist())
-    verification_flags = fetch_verification_flags_cached(items_key)
 
-    summary_df = clean_df.copy()
-    summary_df["IsVerified"] = summary_df["ItemNumber"].map(verification_flags).fillna(False).astype(bool)
+def fetch_verification_flags_cached(items_key: tuple[str, ...]) -> tuple[dict[str, bool], bool]:
+    """
+    Verification flags plus whether they may be cached. The second value is False only
+    when SSAS errored and the deterministic fallback was used; those flags never reach
+    either cache.
+    """
+    try:
+        return _fetch_verification_flags_cached(items_key), True
+    except Exception as exc:
+        LOGGER.warning("Falling back to deterministic verification after SSAS error: %s", exc)
+        unique_items = [item for item in dict.fromkeys(items_key) if item]
+        return _mock_verification_flags(unique_items), False
+
+
+def add_verification_flags(
+    clean_df: pd.DataFrame,
+    verification_flags: dict[str, bool],
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    items = clean_df["ItemNumber"].to_numpy()
+    is_verified = np.fromiter(
+        (verification_flags.get(item, False) for item in items),
+        dtype=bool,
+        count=items.size,
+    )
+    summary_df = clean_df.assign(IsVerified=is_verified)
 
-    verified_df = summary_df[summary_df["IsVerified"]].copy().reset_index(drop=True)
-    unverified_df = summary_df[~summary_df["IsVerified"]].copy().reset_index(drop=True)
+    verified_df = summary_df[is_verified].reset_index(drop=True)
+    unverified_df = summary_df[~is_verified].reset_index(drop=True)
     return summary_df, verified_df, unverified_df
 
 
 # ============================================================
 # PACKAGING API PLACEHOLDER
 # ============================================================
+@lru_cache(maxsize=100_000)
 def stable_seed(item_number: str) -> int:
-    return int(hashlib.sha256(item_number.encode("utf-8")).hexdigest()[:8], 16)
+    return int.from_bytes(hashlib.sha256(item_number.encode("utf-8")).digest()[:4], "big")
 
 
 def build_packaging_payload(
@@ -658,144 +1004,203 @@ def build_packaging_payload(
     destination_state: str,
 ) -> list[dict[str, Any]]:
     """Build placeholder payload schema for future API integration."""
-    ui_cfg = PAGE_CONFIG.get("ui", {})
-    default_warehouse = int(ui_cfg.get("default_warehouse", 105))
-    default_marginal_length = float(ui_cfg.get("default_marginal_length", 0.0))
-    default_marginal_width = float(ui_cfg.get("default_marginal_width", 0.0))
-    default_marginal_height = float(ui_cfg.get("default_marginal_height", 0.0))
-
-    payload: list[dict[str, Any]] = []
-    for row in verified_rows.itertuples(index=False):
-        seed = stable_seed(row.ItemNumber)
-        length = 10 + (seed % 8)
-        width = 8 + ((seed // 8) % 6)
-        height = 4 + ((seed // 64) % 4)
-        volume = length * width * height
-        weight = round(max(1.0, volume / 200.0), 2)
-
-        payload.append(
+    item_numbers = verified_rows["ItemNumber"].to_numpy()
+    seeds = np.fromiter((stable_seed(item) for item in item_numbers), dtype=np.int64, count=len(item_numbers))
+    length = (10 + (seeds % 8)).astype(float)
+    width = (8 + ((seeds // 8) % 6)).astype(float)
+    height = (4 + ((seeds // 64) % 4)).astype(float)
+    volume = length * width * height
+    weight = np.maximum(1.0, volume / 200.0).round(2)
+
+    # Scalars broadcast across rows; column order is the payload key order.
+    payload_df = pd.DataFrame(
+        {
+            "warehouseNumber": UI_DEFAULTS.warehouse,
+            "itemNumber": item_numbers,
+            "quantity": verified_rows["Quantity"].to_numpy(dtype=np.int64),
+            "length": length,
+            "width": width,
+            "height": height,
+            "weight": weight,
+            "isRepack": True,
+            "isRepositional": True,
+            "breakQuantity": 0,
+            "marginalLength": UI_DEFAULTS.marginal_length,
+            "marginalHeight": UI_DEFAULTS.marginal_height,
+            "marginalWidth": UI_DEFAULTS.marginal_width,
+            "canBeNested": False,
+            "volume": volume,
+            "perishableType": "N",
+        }
+    )
+    return payload_df.to_dict(orient="records")
+
+
+def _mock_package(item_payload: dict[str, Any]) -> dict[str, Any]:
+    item_number = item_payload["itemNumber"]
+    quantity = int(item_payload["quantity"])
+    width = float(item_payload["width"])
+    length = float(item_payload["length"])
+    height = float(item_payload["height"])
+    weight = float(item_payload["weight"])
+    volume = float(item_payload["volume"])
+    package_count = max(1, math.ceil(quantity / 4))
+    return {
+        "ContainedDimensions": {"Width": width, "Length": length, "Height": height},
+        "ContainedItems": {item_number: quantity},
+        "Volume": volume,
+        "BoxDimensions": {"Width": width + 2.0, "Length": length + 2.0, "Height": height + 1.0},
+        "Weight": round(weight * package_count, 2),
+        "IsTaped": True,
+        "CumulativeVolume": volume * quantity,
+        "TotalQuantity": quantity,
+        "PackageCount": package_count,
+        "ItemDetails": [
             {
-                "warehouseNumber": default_warehouse,
-                "itemNumber": row.ItemNumber,
-                "quantity": int(row.Quantity),
-                "length": float(length),
-                "width": float(width),
-                "height": float(height),
-                "weight": float(weight),
-                "isRepack": True,
-                "isRepositional": True,
-                "breakQuantity": 0,
-                "marginalLength": default_marginal_length,
-                "marginalHeight": default_marginal_height,
-                "marginalWidth": default_marginal_width,
-                "canBeNested": False,
-                "volume": float(volume),
-                "perishableType": "N",
+                "ItemNumber": item_number,
+                "IsCoolant": False,
+                "Quantity": quantity,
+                "Length": length,
+                "Width": width,
+                "Height": height,
+                "Weight": weight,
             }
-        )
-    return payload
+        ],
+    }
 
 
 def mock_packaging_api_response(payload: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     """Build a mock API response using the published schema shape."""
-    response: dict[str, dict[str, Any]] = {}
-    for idx, item_payload in enumerate(payload, start=1):
-        quantity = int(item_payload["quantity"])
-        package_count = max(1, math.ceil(quantity / 4))
-        box_dims = {
-            "Width": float(item_payload["width"]) + 2.0,
-            "Length": float(item_payload["length"]) + 2.0,
-            "Height": float(item_payload["height"]) + 1.0,
-        }
-
-        response[f"package_{idx}"] = {
-            "ContainedDimensions": {
-                "Width": float(item_payload["width"]),
-                "Length": float(item_payload["length"]),
-                "Height": float(item_payload["height"]),
-            },
-            "ContainedItems": {item_payload["itemNumber"]: quantity},
-            "Volume": float(item_payload["volume"]),
-            "BoxDimensions": box_dims,
-            "Weight": round(float(item_payload["weight"]) * package_count, 2),
-            "IsTaped": True,
-            "CumulativeVolume": float(item_payload["volume"]) * quantity,
-            "TotalQuantity": quantity,
-            "PackageCount": package_count,
-            "ItemDetails": [
-                {
-                    "ItemNumber": item_payload["itemNumber"],
-                    "IsCoolant": False,
-                    "Quantity": quantity,
-                    "Length": float(item_payload["length"]),
-                    "Width": float(item_payload["width"]),
-                    "Height": float(item_payload["height"]),
-                    "Weight": float(item_payload["weight"]),
-                }
-            ],
-        }
-    return response
+    return {
+        f"package_{idx}": _mock_package(item_payload)
+        for idx, item_payload in enumerate(payload, start=1)
+    }
 
 
 def normalize_packaging_response(response_json: dict[str, dict[str, Any]]) -> pd.DataFrame:
     """Normalize API response to tabular output."""
-    rows: list[dict[str, Any]] = []
-    for package_id, package in response_json.items():
-        box_dims = package.get("BoxDimensions", {}) or {}
-        package_count = int(package.get("PackageCount", 1) or 1)
-        package_weight = float(package.get("Weight", 0.0) or 0.0)
-        item_details = package.get("ItemDetails", []) or []
-
-        for detail in item_details:
-            rows.append(
-                {
-                    "PackageId": package_id,
-                    "ItemNumber": str(detail.get("ItemNumber", "")),
-                    "Quantity": int(detail.get("Quantity", 0) or 0),
-                    "PackageCount": package_count,
-                    "Length": float(box_dims.get("Length", 0.0) or 0.0),
-                    "Width": float(box_dims.get("Width", 0.0) or 0.0),
-                    "Height": float(box_dims.get("Height", 0.0) or 0.0),
-                    "Weight": package_weight,
-                }
-            )
-
-    if not rows:
+    # One record per package; missing/None containers become empty so json_normalize
+    # can walk them (same defaults as reading each field with .get(...) or default).
+    records = [
+        {
+            "PackageId": package_id,
+            "PackageCount": package.get("PackageCount"),
+            "Weight": package.get("Weight"),
+            "BoxDimensions": package.get("BoxDimensions") or {},
+            "ItemDetails": package.get("ItemDetails") or [],
+        }
+        for package_id, package in response_json.items()
+    ]
+    details = pd.json_normalize(
+        records,
+        record_path="ItemDetails",
+        meta=[
+            "PackageId",
+            "PackageCount",
+            "Weight",
+            ["BoxDimensions", "Length"],
+            ["BoxDimensions", "Width"],
+            ["BoxDimensions", "Height"],
+        ],
+        record_prefix="Item.",
+        errors="ignore",
+    )
+    if details.empty:
         return pd.DataFrame(columns=PACKAGING_COLUMNS)
-    return pd.DataFrame(rows, columns=PACKAGING_COLUMNS).sort_values(
-        ["ItemNumber", "PackageId"]
-    ).reset_index(drop=True)
 
+    def numeric(column: str, default: float) -> pd.Series:
+        if column not in details.columns:
+            return pd.Series(default, index=details.index)
+        # "value or default": missing and zero both fall back to the default.
+        values = pd.to_numeric(details[column], errors="coerce").fillna(0)
+        return values.mask(values == 0, default)
+
+    item_numbers = (
+        details["Item.ItemNumber"].fillna("").astype(str)
+        if "Item.ItemNumber" in details.columns
+        else ""
+    )
+    packaging_df = pd.DataFrame(
+        {
+            "PackageId": details["PackageId"],
+            "ItemNumber": item_numbers,
+            "Quantity": numeric("Item.Quantity", 0).astype(int),
+            "PackageCount": numeric("PackageCount", 1).astype(int),
+            "Length": numeric("BoxDimensions.Length", 0.0).astype(float),
+            "Width": numeric("BoxDimensions.Width", 0.0).astype(float),
+            "Height": numeric("BoxDimensions.Height", 0.0).astype(float),
+            "Weight": numeric("Weight", 0.0).astype(float),
+        },
+        columns=PACKAGING_COLUMNS,
+    )
+    return packaging_df.sort_values(["ItemNumber", "PackageId"]).reset_index(drop=True)
 
-def call_packaging_api(verified_rows: pd.DataFrame) -> pd.DataFrame:
+
+def call_packaging_api(verified_rows: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, Any]]:
     """
     Input: dataframe with ItemNumber and Quantity (verified only), also create variables
     for all other variables needed by the query.
-    Output: normalized dataframe of package results.
+    Output: normalized dataframe of package results, plus a debug preview of the
+    first payload items and first response package from the same call.
     Placeholder: return mock results with expected schema.
     """
     # TODO(API): Add authentication and real HTTP requests to configured endpoint.
     if verified_rows.empty:
-        return pd.DataFrame(columns=PACKAGING_COLUMNS)
+        return pd.DataFrame(columns=PACKAGING_COLUMNS), {}
 
     destination_state = "FL"
     payload = build_packaging_payload(verified_rows, destination_state=destination_state)
     response_json = mock_packaging_api_response(payload)
-    return normalize_packaging_response(response_json)
+    first_package_id = next(iter(response_json), None)
+    preview = {
+        "payload_preview": payload[:3],
+        "response_preview": (
+            {first_package_id: response_json[first_package_id]} if first_package_id else {}
+        ),
+    }
+    return normalize_packaging_response(response_json), preview
 
 
 @st.cache_data(show_spinner=False)
-def call_packaging_api_cached(verified_key: tuple[tuple[str, int], ...]) -> pd.DataFrame:
-    verified_rows = pd.DataFrame(verified_key, columns=["ItemNumber", "Quantity"])
+def call_packaging_api_cached(items_key: bytes, qty_key: bytes) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """
+    Cached packaging call. Keys are packed bytes (separator-joined item numbers and
+    int64 quantities) so the cache hashes two buffers instead of one tuple per row.
+    """
+    verified_rows = pd.DataFrame(
+        {
+            "ItemNumber": items_key.decode("utf-8").split(ITEM_KEY_SEPARATOR),
+            "Quantity": np.frombuffer(qty_key, dtype=np.int64),
+        }
+    )
     return call_packaging_api(verified_rows)
 
 
 # ============================================================
 # PIPELINE
 # ============================================================
-def run_pipeline(standard_input_df: pd.DataFrame) -> dict[str, Any]:
-    """Run the load -> verify -> split -> package workflow."""
+def verify_input_rows(
+    standard_input_df: pd.DataFrame,
+) -> tuple[pd.DataFrame, list[str], dict[str, bool], bool]:
+    """
+    Validate the input rows and look up their verification flags. The last value is
+    False when SSAS errored and the flags are the deterministic fallback.
+    """
     clean_df, row_errors = validate_and_aggregate_rows(standard_input_df)
+    if clean_df.empty:
+        return clean_df, row_errors, {}, True
+    verification_flags, flags_cacheable = fetch_verification_flags_cached(
+        tuple(clean_df["ItemNumber"].tolist())
+    )
+    return clean_df, row_errors, verification_flags, flags_cacheable
+
+
+def run_pipeline(
+    clean_df: pd.DataFrame,
+    row_errors: list[str],
+    verification_flags: dict[str, bool],
+) -> dict[str, Any]:
+    """Run the split -> package workflow on validated rows and their verification flags."""
     if clean_df.empty:
         return {
             "summary_df": pd.DataFrame(columns=SUMMARY_COLUMNS),
@@ -806,19 +1211,18 @@ def run_pipeline(standard_input_df: pd.DataFrame) -> dict[str, Any]:
             "debug": {},
         }
 
-    summary_df, verified_df, unverified_df = add_verification_flags(clean_df)
+    summary_df, verified_df, unverified_df = add_verification_flags(clean_df, verification_flags)
 
     packaging_df = pd.DataFrame(columns=PACKAGING_COLUMNS)
     payload_preview: list[dict[str, Any]] = []
     response_preview: dict[str, Any] = {}
     destination_state = "FL"
     if not verified_df.empty:
-        verified_key = tuple(
-            (row.ItemNumber, int(row.Quantity)) for row in verified_df.itertuples(index=False)
-        )
-        packaging_df = call_packaging_api_cached(verified_key)
-        payload_preview = build_packaging_payload(verified_df, destination_state=destination_state)[:3]
-        response_preview = mock_packaging_api_response(payload_preview[:1]) if payload_preview else {}
+        items_key = ITEM_KEY_SEPARATOR.join(verified_df["ItemNumber"]).encode("utf-8")
+        qty_key = verified_df["Quantity"].to_numpy(dtype=np.int64).tobytes()
+        packaging_df, api_preview = call_packaging_api_cached(items_key, qty_key)
+        payload_preview = api_preview.get("payload_preview", [])
+        response_preview = api_preview.get("response_preview", {})
 
     LOGGER.info(
         "Packaging load complete | total=%s verified=%s unverified=%s errors=%s",
@@ -844,6 +1248,38 @@ def run_pipeline(standard_input_df: pd.DataFrame) -> dict[str, Any]:
     }
 
 
+def standard_input_key(standard_input_df: pd.DataFrame) -> str:
+    """Digest of the raw input rows (item, quantity, row number) for keying pipeline results."""
+    digest = hashlib.blake2b(digest_size=16)
+    for col in ("ItemNumber", "Quantity", "_RowNumber"):
+        digest.update(ITEM_KEY_SEPARATOR.join(map(str, standard_input_df[col].tolist())).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner="Running packaging pipeline...")
+def _run_pipeline_cached(
+    input_key: str,
+    _clean_df: pd.DataFrame,
+    _row_errors: list[str],
+    _verification_flags: dict[str, bool],
+) -> dict[str, Any]:
+    """Cached run_pipeline; input_key identifies the rows the other arguments came from."""
+    return run_pipeline(_clean_df, _row_errors, _verification_flags)
+
+
+def run_pipeline_cached(input_key: str, standard_input_df: pd.DataFrame) -> dict[str, Any]:
+    """
+    Load -> verify -> split -> package, cached on input_key (see standard_input_key).
+    Validation and the (separately cached) flag lookup run first; a run whose flags
+    are an SSAS-error fallback skips the pipeline cache entirely.
+    """
+    clean_df, row_errors, verification_flags, flags_cacheable = verify_input_rows(standard_input_df)
+    if not flags_cacheable:
+        return run_pipeline(clean_df, row_errors, verification_flags)
+    return _run_pipeline_cached(input_key, clean_df, row_errors, verification_flags)
+
+
 # ============================================================
 # UI: INPUT
 # ============================================================
@@ -855,6 +1291,7 @@ upload_columns: list[str] = []
 upload_has_valid_columns = False
 default_item_idx = 0
 default_qty_idx = 1
+paste_submitted = False
 
 with spacer_col:
     st.write("")
@@ -872,8 +1309,9 @@ with input_col:
 
         if uploaded_file is not None:
             try:
-                uploaded_df = read_excel_bytes(uploaded_file.getvalue())
-                uploaded_df.columns = [str(col).strip() for col in uploaded_df.columns]
+                uploaded_df, upload_columns, default_item_idx, default_qty_idx = peek_upload(
+                    uploaded_file.getvalue()
+                )
             except Exception as exc:
                 uploaded_df = pd.DataFrame()
                 input_parse_errors.append(f"Could not read Excel file: {exc}")
@@ -883,29 +1321,19 @@ with input_col:
             elif len(uploaded_df.columns) < 2:
                 st.error("Excel input must contain at least two columns: Item Number and Quantity.")
             else:
-                upload_columns = uploaded_df.columns.tolist()
-                default_item_idx = find_default_column(
-                    columns=upload_columns,
-                    targets={"itemnumber", "item", "itemno", "sku"},
-                    fallback_index=0,
-                )
-                default_qty_idx = find_default_column(
-                    columns=upload_columns,
-                    targets={"quantity", "qty"},
-                    fallback_index=1,
-                )
-                if default_qty_idx == default_item_idx and len(upload_columns) > 1:
-                    default_qty_idx = 1 if default_item_idx == 0 else 0
                 upload_has_valid_columns = True
         else:
             st.caption("Upload an Excel file with item and quantity columns, then click Load.")
 
     else:
-        pasted_text = st.text_area(
-            "Paste ItemNumber and Quantity rows",
-            height=220,
-            placeholder="871WAR1913F\t5\n000123ABC\t2\n",
-        )
+        # Edits to the pasted text are batched until Load, instead of rerunning per edit.
+        with st.form("packaging_paste_form", border=False):
+            pasted_text = st.text_area(
+                "Paste ItemNumber and Quantity rows",
+                height=220,
+                placeholder="871WAR1913F\t5\n000123ABC\t2\n",
+            )
+            paste_submitted = st.form_submit_button("Load", type="primary")
         standard_input_df, input_parse_errors = parse_pasted_input(pasted_text)
         st.caption("Paste tab-separated rows copied from Excel. Empty lines are ignored.")
 
@@ -928,16 +1356,15 @@ with preview_col:
                 key="pe_qty_column",
             )
 
-        standard_input_df = uploaded_df[[item_column, qty_column]].copy()
-        standard_input_df.columns = ["ItemNumber", "Quantity"]
-        standard_input_df["_RowNumber"] = standard_input_df.index + 2
+        # Preview/enablement only: built from the peeked rows. Load reads the full sheet.
+        standard_input_df = build_upload_input(uploaded_df, item_column, qty_column)
 
     if standard_input_df.empty:
         st.info("Preview will appear here after input is provided.")
     else:
         st.caption("Preview shows the first 5 items only.")
         st.dataframe(
-            standard_input_df[["ItemNumber", "Quantity"]].head(5),
+            standard_input_df.iloc[:5][["ItemNumber", "Quantity"]],
             width="stretch",
             hide_index=True,
         )
@@ -945,8 +1372,18 @@ with preview_col:
 
 with input_col:
     has_input_rows = not standard_input_df.empty
-    if st.button("Load", type="primary", width="content", disabled=not has_input_rows):
+    if input_mode == INPUT_MODE_UPLOAD:
+        load_clicked = st.button("Load", type="primary", width="content", disabled=not has_input_rows)
+    else:
+        load_clicked = paste_submitted and has_input_rows
+    if load_clicked:
         try:
+            if input_mode == INPUT_MODE_UPLOAD and upload_has_valid_columns:
+                standard_input_df = load_upload_rows(
+                    uploaded_file.getvalue(),
+                    upload_columns.index(item_column),
+                    upload_columns.index(qty_column),
+                )
             runtime_cfg = load_packaging_config()
             runtime_ssas = runtime_cfg.get("ssas", {}) if isinstance(runtime_cfg.get("ssas"), dict) else {}
             page_ssas = PAGE_CONFIG.get("ssas", {}) if isinstance(PAGE_CONFIG.get("ssas"), dict) else {}
@@ -965,7 +1402,9 @@ with input_col:
                     "Clear Streamlit cache/restart to reload PAGE_CONFIG."
                 )
 
-            pipeline_results = run_pipeline(standard_input_df)
+            pipeline_results = run_pipeline_cached(
+                standard_input_key(standard_input_df), standard_input_df
+            )
             combined_errors = input_parse_errors + pipeline_results.get("row_errors", [])
 
             st.session_state.pe_loaded = True
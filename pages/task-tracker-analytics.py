@@ -11,6 +11,7 @@ What it does:
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import altair as alt
 import config
@@ -44,6 +45,17 @@ def format_duration(seconds: float) -> str:
     return f"{round(seconds / 3600, 2)} hr"
 
 
+def _sorted_unique(values: pd.Series) -> list:
+    # Categories are already unique and sorted; otherwise dedupe + sort in one numpy pass.
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.categories.tolist()
+    return np.unique(values.dropna().to_numpy()).tolist()
+
+
+def _to_hours(seconds: np.ndarray) -> np.ndarray:
+    return np.round(np.divide(seconds, 3600.0), 2)
+
+
 @st.cache_data(ttl=300)
 def load_targets_placeholder() -> pd.DataFrame:
     return pd.DataFrame({"TaskName": [], "TargetSeconds": []})
@@ -60,48 +72,64 @@ def main_filters(df: pd.DataFrame) -> pd.DataFrame:
     with c1:
         user_filter = st.selectbox(
             "User",
-            options=["All"] + sorted(df["FullName"].dropna().unique().tolist()),
+            options=["All"] + _sorted_unique(df["FullName"]),
         )
 
     with c2:
         task_filter = st.multiselect(
             "Task",
-            options=sorted(df["TaskName"].unique().tolist()),
+            options=_sorted_unique(df["TaskName"]),
             default=[],
         )
 
     with c3:
         cadence_filter = st.multiselect(
             "Cadence",
-            options=sorted(df["TaskCadence"].dropna().unique().tolist()),
+            options=_sorted_unique(df["TaskCadence"]),
             default=[],
         )
 
     with c4:
         date_range = st.date_input(
             "Date Range",
-            value=(df["Date"].min(), df["Date"].max()),
+            value=(df["Date"].min().date(), df["Date"].max().date()),
         )
 
-    filtered_df = df.copy()
+    if isinstance(date_range, tuple):
+        start_date, end_date = date_range
+    else:
+        start_date = end_date = date_range
+
+    # Reuse the last filtered frame when neither the filters nor the loaded data changed
+    # (reruns from unrelated widgets). len + latest start timestamp identify the data.
+    filter_key = (
+        user_filter,
+        tuple(task_filter),
+        tuple(cadence_filter),
+        start_date,
+        end_date,
+        len(df),
+        df["StartTimestampUTC"].max(),
+    )
+    if st.session_state.get("analytics_filter_key") == filter_key:
+        return st.session_state.analytics_filtered_df, user_filter
+
+    # Combine every filter into one mask and slice once (no defensive copy of df).
+    dates = df["Date"].to_numpy()
+    mask = (dates >= np.datetime64(start_date, "D")) & (dates <= np.datetime64(end_date, "D"))
 
     if user_filter != "All":
-        filtered_df = filtered_df[filtered_df["FullName"] == user_filter]
+        mask &= (df["FullName"] == user_filter).to_numpy(dtype=bool)
 
     if task_filter:
-        filtered_df = filtered_df[filtered_df["TaskName"].isin(task_filter)]
+        mask &= df["TaskName"].isin(task_filter).to_numpy(dtype=bool)
 
     if cadence_filter:
-        filtered_df = filtered_df[filtered_df["TaskCadence"].isin(cadence_filter)]
+        mask &= df["TaskCadence"].isin(cadence_filter).to_numpy(dtype=bool)
 
-    if isinstance(date_range, tuple):
-        start_date, end_date = date_range
-    else:
-        start_date = end_date = date_range
-
-    filtered_df = filtered_df[
-        (filtered_df["Date"] >= start_date) & (filtered_df["Date"] <= end_date)
-    ]
+    filtered_df = df[mask]
+    st.session_state.analytics_filter_key = filter_key
+    st.session_state.analytics_filtered_df = filtered_df
 
     return filtered_df, user_filter
 
@@ -110,59 +138,51 @@ def main_filters(df: pd.DataFrame) -> pd.DataFrame:
 # SECTION 2 — KPIs + CHARTS
 # ============================================================
 def main_charts(filtered_df: pd.DataFrame) -> None:
+    filtered_df = filtered_df[["DurationSeconds", "Date", "TaskName", "TaskCadence"]]
+
+    # One hash groupby over (date, cadence, task); the KPIs and every chart below are
+    # marginals of it. dropna=False keeps rows missing one key so the others still count them.
+    by_day_cadence_task = filtered_df.groupby(
+        ["Date", "TaskCadence", "TaskName"], observed=True, dropna=False
+    )["DurationSeconds"].agg(["size", "count", "sum"])
+    duration_by_pair = by_day_cadence_task["sum"]
+
     # ---------------- KPIs ----------------
     total_tasks = len(filtered_df)
-    total_time = filtered_df["DurationSeconds"].sum()
-    avg_time = filtered_df["DurationSeconds"].mean()
-
-    k1, k2, k3 = st.columns(3)
-    with k1:
-        st.markdown(
-            f'<div class="kpi-card"><div class="kpi-value">{total_tasks}</div><div class="kpi-label">Tasks</div></div>',
-            unsafe_allow_html=True,
-        )
-    with k2:
-        st.markdown(
-            f'<div class="kpi-card"><div class="kpi-value">{format_duration(total_time)}</div><div class="kpi-label">Total Time</div></div>',
-            unsafe_allow_html=True,
-        )
-    with k3:
-        st.markdown(
-            f'<div class="kpi-card"><div class="kpi-value">{format_duration(avg_time)}</div><div class="kpi-label">Avg Time / Task</div></div>',
-            unsafe_allow_html=True,
-        )
+    total_time = by_day_cadence_task["sum"].sum()
+    timed_tasks = by_day_cadence_task["count"].sum()
+    avg_time = total_time / timed_tasks if timed_tasks else float("nan")
+
+    # All cards in one markdown element (one frontend delta instead of three columns).
+    st.markdown(
+        '<div class="kpi-row">'
+        f'<div class="kpi-card"><div class="kpi-value">{total_tasks}</div><div class="kpi-label">Tasks</div></div>'
+        f'<div class="kpi-card"><div class="kpi-value">{format_duration(total_time)}</div><div class="kpi-label">Total Time</div></div>'
+        f'<div class="kpi-card"><div class="kpi-value">{format_duration(avg_time)}</div><div class="kpi-label">Avg Time / Task</div></div>'
+        "</div>",
+        unsafe_allow_html=True,
+    )
 
     st.divider()
 
     # ---------------- Time Series ----------------
-    time_df = (
-        filtered_df.groupby("Date", as_index=False)
-        .size()
-        .rename(columns={"size": "Tasks"})
-    )
+    # Plain daily counts: the built-in line chart needs no altair spec (it has its own tooltips).
+    tasks_per_day = by_day_cadence_task["size"].groupby(level="Date").sum().rename("Tasks")
 
-    time_chart = (
-        alt.Chart(time_df)
-        .mark_line(point=True)
-        .encode(
-            x="Date:T",
-            y="Tasks:Q",
-            tooltip=["Date", "Tasks"],
-        )
-        .properties(title="Tasks per Day")
-    )
-
-    st.altair_chart(time_chart, use_container_width=True)
+    st.markdown("**Tasks per Day**")
+    st.line_chart(tasks_per_day, x_label="Date", y_label="Tasks", height=280)
 
     # ---------------- Breakdown Charts ----------------
+
     left, right = st.columns(2)
 
     with left:
         cad_df = (
-            filtered_df.groupby("TaskCadence", as_index=False)["DurationSeconds"]
+            duration_by_pair.groupby(level="TaskCadence", observed=True)
             .sum()
+            .reset_index(name="DurationSeconds")
         )
-        cad_df["Hours"] = (cad_df["DurationSeconds"] / 3600).round(2)
+        cad_df["Hours"] = _to_hours(cad_df["DurationSeconds"].to_numpy(dtype=float))
 
         cad_chart = (
             alt.Chart(cad_df)
@@ -179,11 +199,12 @@ def main_charts(filtered_df: pd.DataFrame) -> None:
 
     with right:
         task_df = (
-            filtered_df.groupby("TaskName", as_index=False)["DurationSeconds"]
+            duration_by_pair.groupby(level="TaskName", observed=True)
             .sum()
-            .nlargest(10, "DurationSeconds")
+            .nlargest(10)
+            .reset_index(name="DurationSeconds")
         )
-        task_df["Hours"] = (task_df["DurationSeconds"] / 3600).round(2)
+        task_df["Hours"] = _to_hours(task_df["DurationSeconds"].to_numpy(dtype=float))
 
         task_chart = (
             alt.Chart(task_df)
@@ -202,31 +223,31 @@ def main_charts(filtered_df: pd.DataFrame) -> None:
 # ============================================================
 # SECTION 3 — PERFORMANCE REVIEW
 # ============================================================
-def main_performance_review(filtered_df: pd.DataFrame, user_filter: str) -> None:
-    if user_filter == "All":
-        return
-
-    st.divider()
-    st.subheader("Performance Review", anchor=False)
-
-    user_df = filtered_df[filtered_df["FullName"] == user_filter]
-    team_df = filtered_df[filtered_df["FullName"] != user_filter]
+def build_performance_review(filtered_df: pd.DataFrame, user_filter: str) -> pd.DataFrame:
+    # One count per (task, user) pair; the user and team sides are both slices of it.
+    # Categorical columns report every category, so keep only observed pairs.
+    pair_counts = (
+        filtered_df[["TaskName", "FullName"]]
+        .value_counts()
+        .loc[lambda counts: counts > 0]
+    )
+    is_user = pair_counts.index.get_level_values("FullName") == user_filter
 
     user_counts = (
-        user_df.groupby("TaskName")
-        .size()
+        pair_counts[is_user]
+        .droplevel("FullName")
+        .rename_axis("TaskName")
         .reset_index(name="Completed")
     )
 
     team_avg = (
-        team_df.groupby(["TaskName", "FullName"])
-        .size()
-        .groupby("TaskName")
+        pair_counts[~is_user]
+        .groupby(level="TaskName", observed=True)
         .mean()
         .reset_index(name="Team Average")
     )
 
-    comp_df = (
+    return (
         user_counts
         .merge(team_avg, on="TaskName", how="left")
         .assign(Target="TBD")
@@ -234,6 +255,21 @@ def main_performance_review(filtered_df: pd.DataFrame, user_filter: str) -> None
         .rename(columns={"TaskName": "Task"})
     )
 
+
+def main_performance_review(filtered_df: pd.DataFrame, user_filter: str) -> None:
+    if user_filter == "All":
+        return
+
+    st.divider()
+    st.subheader("Performance Review", anchor=False)
+
+    # Same memo as main_filters: the table only changes when the filters/data do.
+    filter_key = st.session_state.get("analytics_filter_key")
+    if st.session_state.get("analytics_review_key") != filter_key:
+        st.session_state.analytics_review_df = build_performance_review(filtered_df, user_filter)
+        st.session_state.analytics_review_key = filter_key
+    comp_df = st.session_state.analytics_review_df
+
     st.dataframe(comp_df, hide_index=True, width="stretch")
 
 
@@ -242,7 +278,6 @@ def main_performance_review(filtered_df: pd.DataFrame, user_filter: str) -> None
 # ============================================================
 def main() -> None:
     LOGGER.info("Task Tracker Analytics page rendered.")
-    st.markdown(utils.get_global_css(), unsafe_allow_html=True)
 
     user_ctx = utils.get_user_context()
     if not user_ctx.can_view_analytics:
@@ -256,21 +291,7 @@ def main() -> None:
         st.warning("No completed task data available.")
         return
 
-    if "PartiallyComplete" not in df.columns:
-        df["PartiallyComplete"] = False
-    else:
-        df["PartiallyComplete"] = df["PartiallyComplete"].fillna(False).astype(bool)
-
-    logo_b64 = utils.get_logo_base64(str(config.LOGO_PATH))
-    st.markdown(
-        f"""
-        <div class="header-row">
-            <img class="header-logo" src="data:image/png;base64,{logo_b64}" />
-            <h1 class="header-title">LS - Tasks Analytics</h1>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(utils.get_page_header_html("LS - Tasks Analytics"), unsafe_allow_html=True)
     st.divider()
 
     filtered_df, user_filter = main_filters(df)
@@ -18,8 +18,7 @@ What it does:
         * Today's Activity (completed tasks)
 
 Key utils used (inputs -> outputs):
-    - utils.get_global_css() -> str
-    - utils.get_logo_base64(logo_path) -> str
+    - utils.get_page_header_html(title) -> str
     - utils.get_os_user() -> str
     - utils.get_full_name_for_user(None, user_login) -> str
     - utils.load_all_user_full_names() -> list[str]
@@ -33,7 +32,7 @@ Key utils used (inputs -> outputs):
     - utils.parse_hhmmss("HH:MM[:SS]") -> int seconds or -1
     - utils.format_time_ago(dt) -> str
     - utils.build_out_dir(completed_dir, user_key, ts) -> Path
-    - utils.atomic_write_parquet(df, path, schema) -> writes parquet atomically
+    - utils.atomic_write_parquet(df_or_record, path, schema) -> writes parquet atomically
     - Live Activity:
         * utils.save_live_activity(...)
         * utils.update_live_activity_state(...)
@@ -57,11 +56,12 @@ Primary outputs:
 
 import streamlit as st
 import pandas as pd
+import time
 import uuid
 from pathlib import Path
+from types import SimpleNamespace
 import config
 import utils
-from streamlit_autorefresh import st_autorefresh
 
 LOGGER = utils.get_program_logger(
     "task_tracker_page",
@@ -71,15 +71,13 @@ LOGGER = utils.get_program_logger(
 # Page configuration
 st.set_page_config(page_title="Task Tracker", layout="wide")
 
-# Apply global styling
-st.markdown(utils.get_global_css(), unsafe_allow_html=True)
-
 # Resolve paths and constants
 COMPLETED_TASKS_DIR = config.COMPLETED_TASKS_DIR
 LIVE_ACTIVITY_DIR = config.LIVE_ACTIVITY_DIR
 ARCHIVED_TASKS_DIR = config.ARCHIVED_TASKS_DIR
 PERSONNEL_DIR = config.PERSONNEL_DIR
-LOGO_PATH = config.LOGO_PATH
+CADENCE_ORDER = ["Daily", "Weekly", "Periodic"]
+TIMER_REFRESH_SECONDS = 10
 
 # Session state initialization
 DEFAULT_STATE = {
@@ -114,6 +112,17 @@ for k, v in DEFAULT_STATE.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+def widget_keys(counter: int) -> SimpleNamespace:
+    """Widget keys for one reset cycle (bumping reset_counter gives fresh widgets)."""
+    return SimpleNamespace(
+        task=f"task_{counter}",
+        acct=f"acct_{counter}",
+        covering=f"covering_{counter}",
+        cadence={cadence: f"cad_{cadence}_{counter}" for cadence in CADENCE_ORDER},
+    )
+
+KEYS = widget_keys(st.session_state.reset_counter)
+
 if "task_tracker_log_session_initialized" not in st.session_state:
     LOGGER.info("Task Tracker session initialized.")
     st.session_state.task_tracker_log_session_initialized = True
@@ -138,15 +147,31 @@ if not st.session_state.state_restored:
         st.session_state.restored_covering_for = restored["covering_for"]
 
 # Business logic functions
+@st.cache_data(ttl=3600)
+def load_task_indexes() -> tuple[list[str], dict[str, list[str]]]:
+    """Return sorted task names and each task's available cadences (in CADENCE_ORDER)."""
+    tasks_df = utils.load_tasks()
+    if tasks_df.empty:
+        return [], {}
+    cadence_map = (
+        tasks_df.dropna(subset=["TaskCadence"])
+        .groupby("TaskName")["TaskCadence"]
+        .agg(lambda s: [c for c in CADENCE_ORDER if c in set(s)])
+        .to_dict()
+    )
+    return sorted(tasks_df["TaskName"].unique()), cadence_map
+
 def compute_elapsed_seconds() -> int:
     """Compute total elapsed seconds for current task (excluding paused time)."""
     if not st.session_state.start_utc:
         return 0
-    now = st.session_state.end_utc if st.session_state.state == "ended" else utils.now_utc()
-    base = int((now - st.session_state.start_utc).total_seconds())
+    # Plain epoch-second math on each tick; the datetimes stay the source of truth
+    # because they are persisted to (and restored from) the live activity file.
+    now_ts = st.session_state.end_utc.timestamp() if st.session_state.state == "ended" else time.time()
+    base = int(now_ts - st.session_state.start_utc.timestamp())
     paused = int(st.session_state.paused_seconds or 0)
     if st.session_state.pause_start_utc:
-        pause_delta = int((now - st.session_state.pause_start_utc).total_seconds())
+        pause_delta = int(now_ts - st.session_state.pause_start_utc.timestamp())
         if pause_delta > 0:
             paused += pause_delta
     return max(0, base - paused)
@@ -156,10 +181,10 @@ def reset_all():
     LOGGER.info("Resetting task tracker state.")
     if "current_user_key" in st.session_state:
         utils.delete_live_activity(LIVE_ACTIVITY_DIR, st.session_state.current_user_key)
-    old_counter = st.session_state.reset_counter
+    old_keys = widget_keys(st.session_state.reset_counter)
     st.session_state.reset_counter += 1
     # Remove old widget state keys
-    for key in [f"task_{old_counter}", f"acct_{old_counter}", f"covering_{old_counter}"]:
+    for key in [old_keys.task, old_keys.acct, old_keys.covering]:
         st.session_state.pop(key, None)
     # Reset all state values (except restoration flag)
     for k, v in DEFAULT_STATE.items():
@@ -336,11 +361,10 @@ def confirm_submit(user_login, full_name, user_key, task_name, selected_account)
                 parsed_duration,
                 st.session_state.get("submit_partially_complete", False),
             )
-            df_record = pd.DataFrame([record])
             out_dir = utils.build_out_dir(COMPLETED_TASKS_DIR, user_key, st.session_state.start_utc)
             eastern_start = utils.to_eastern(st.session_state.start_utc)
             fname = f"task_{eastern_start:%Y%m%d_%H%M%S}_{record['TaskID'][:8]}.parquet"
-            utils.atomic_write_parquet(df_record, out_dir / fname)
+            utils.atomic_write_parquet(record, out_dir / fname)
             LOGGER.info(
                 "Completed task uploaded | user=%s task=%s cadence=%s file=%s",
                 user_login,
@@ -449,17 +473,26 @@ def live_activity_section():
         })
         st.dataframe(display_cols, hide_index=True, width="stretch")
 
+# Elapsed timer (only this fragment reruns on each tick while a task is running)
+@st.fragment(run_every=TIMER_REFRESH_SECONDS if st.session_state.state == "running" else None)
+def elapsed_timer_section():
+    st.session_state.elapsed_seconds = compute_elapsed_seconds()
+    hh, mm = utils.format_hh_mm_parts(st.session_state.elapsed_seconds)
+    colon_class = "blink-colon" if st.session_state.state == "running" else ""
+    st.markdown(
+        f"""
+        <div style="text-align:center;margin-bottom:20px;">
+            <div style="font-size:36px;font-weight:600;">
+                {hh}<span class="{colon_class}">:</span>{mm}
+            </div>
+            <div style="font-size:15px;color:#6b6b6b;">Elapsed Time</div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
 # Header
-logo_b64 = utils.get_logo_base64(str(LOGO_PATH))
-st.markdown(
-    f"""
-    <div class="header-row">
-        <img class="header-logo" src="data:image/png;base64,{logo_b64}" />
-        <h1 class="header-title">LS - Task Tracker</h1>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+st.markdown(utils.get_page_header_html("LS - Task Tracker"), unsafe_allow_html=True)
 st.divider()
 if st.session_state.get("uploaded"):
     st.toast("Upload Successful", icon="✅")
@@ -480,7 +513,7 @@ with left_col:
     all_users = utils.load_all_user_full_names()
     # Exclude current user from covering list
     covering_options = [""] + [u for u in all_users if u != full_name]
-    covering_key = f"covering_{st.session_state.reset_counter}"
+    covering_key = KEYS.covering
     # Restore covering selection if present
     if st.session_state.restored_covering_for and covering_key not in st.session_state:
         if st.session_state.restored_covering_for in covering_options:
@@ -492,7 +525,7 @@ with left_col:
         key=covering_key,
     )
     account_options = [""] + utils.load_accounts(str(PERSONNEL_DIR))
-    acct_key = f"acct_{st.session_state.reset_counter}"
+    acct_key = KEYS.acct
     if st.session_state.restored_account and acct_key not in st.session_state:
         if st.session_state.restored_account in account_options:
             st.session_state[acct_key] = st.session_state.restored_account
@@ -501,17 +534,14 @@ with left_col:
     archived_count = len(utils.load_archived_tasks(ARCHIVED_TASKS_DIR, user_key))
 
 with mid_col:
-    tasks_df = utils.load_tasks()
-    task_options = [""] + sorted(tasks_df["TaskName"].unique()) if not tasks_df.empty else [""]
-    task_key = f"task_{st.session_state.reset_counter}"
+    task_names, cadence_map = load_task_indexes()
+    task_options = [""] + task_names
+    task_key = KEYS.task
     if st.session_state.restored_task_name and task_key not in st.session_state:
         if st.session_state.restored_task_name in task_options:
             st.session_state[task_key] = st.session_state.restored_task_name
     task_name = st.selectbox("Task", task_options, disabled=inputs_locked, key=task_key)
-    CADENCE_ORDER = ["Daily", "Weekly", "Periodic"]
-    available_cadences = []
-    if task_name:
-        available_cadences = tasks_df.loc[tasks_df["TaskName"] == task_name, "TaskCadence"].dropna().unique().tolist()
+    available_cadences = cadence_map.get(task_name, []) if task_name else []
     # Auto-select cadence if needed
     if task_name and st.session_state.state == "idle":
         if task_name != st.session_state.last_task_name:
@@ -526,24 +556,11 @@ with mid_col:
         disabled = (not task_name) or (cadence not in available_cadences) or (inputs_locked and not is_selected)
         with col:
             st.button(cadence, disabled=disabled, type="primary" if is_selected else "secondary",
-                      key=f"cad_{cadence}_{st.session_state.reset_counter}", on_click=select_cadence, args=(cadence,), width="stretch")
+                      key=KEYS.cadence[cadence], on_click=select_cadence, args=(cadence,), width="stretch")
     st.text_area("Notes (optional)", key="notes", height=120)
 
 with right_col:
-    st.session_state.elapsed_seconds = compute_elapsed_seconds()
-    hh, mm = utils.format_hh_mm_parts(st.session_state.elapsed_seconds)
-    colon_class = "blink-colon" if st.session_state.state == "running" else ""
-    st.markdown(
-        f"""
-        <div style="text-align:center;margin-bottom:20px;">
-            <div style="font-size:36px;font-weight:600;">
-                {hh}<span class="{colon_class}">:</span>{mm}
-            </div>
-            <div style="font-size:15px;color:#6b6b6b;">Elapsed Time</div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    elapsed_timer_section()
     if st.session_state.state == "idle":
         c1, c2 = st.columns(2)
         can_start = bool(task_name and st.session_state.selected_cadence)
@@ -678,5 +695,3 @@ else:
 
 # Footer with app version
 st.caption(f"\n\n\nApp version: {config.APP_VERSION}", text_alignment="center")
-if st.session_state.state == "running":
-    st_autorefresh(interval=10000, key="timer")
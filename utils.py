@@ -13,12 +13,14 @@ What it does:
     - Identity/helpers:
         * get_os_user() -> str (cached)
         * sanitize_key(str) -> str (safe filesystem/user key)
+        * get_user_cache_dir(name) -> Path (per-user local cache folder)
         * UserContext + get_user_context() -> permission-ready user metadata
     - Styling/assets:
-        * get_global_css() -> str (cached CSS)
+        * get_global_css() -> str (cached CSS, emitted once per run by app.py)
         * get_logo_base64(path) -> str base64 (cached)
+        * get_page_header_html(title) -> str logo + title header markup (cached)
     - Parquet I/O (atomic, schema-driven):
-        * atomic_write_parquet(df, path, schema) -> writes parquet safely
+        * atomic_write_parquet(df_or_record, path, schema) -> writes parquet safely
         * build_out_dir(completed_dir, user_key, ts) -> Path partitioned by date
     - Live Activity (real-time collaboration via small parquet files):
         * save_live_activity(...) -> writes user=<key>.parquet
@@ -67,6 +69,10 @@ import config
 # Timezone for Eastern Time
 EASTERN_TZ = ZoneInfo("America/New_York")
 
+# Patterns used by sanitize_key
+_WHITESPACE_RE = re.compile(r"\s+")
+_UNSAFE_KEY_CHARS_RE = re.compile(r"[^a-z0-9_\-\.]")
+
 # Define schemas for Parquet files
 PARQUET_SCHEMA = pa.schema([
     ("TaskID", pa.string()),
@@ -138,10 +144,7 @@ def to_eastern(dt: datetime) -> datetime:
 @lru_cache(maxsize=128)
 def sanitize_key(value: str) -> str:
     """Sanitize a string to be filesystem-friendly and lowercase."""
-    value = value.strip().lower()
-    value = re.sub(r"\s+", "_", value)
-    value = re.sub(r"[^a-z0-9_\-\.]", "", value)
-    return value
+    return _UNSAFE_KEY_CHARS_RE.sub("", _WHITESPACE_RE.sub("_", value.strip().lower()))
 
 
 @lru_cache(maxsize=16)
@@ -154,6 +157,15 @@ def get_user_pages_log_dir(user_login: str | None = None) -> Path:
     return log_dir
 
 
+def get_user_cache_dir(name: str, user_login: str | None = None) -> Path:
+    """Ensure and return a per-user cache directory: LOG_BASE_DIR/<user>/cache/<name>."""
+    user_name = str(user_login or get_os_user()).strip()
+    user_key = sanitize_key(user_name) or "unknown_user"
+    cache_dir = Path(config.LOG_BASE_DIR) / user_key / "cache" / name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
 @lru_cache(maxsize=64)
 def get_program_logger(
     logger_name: str,
@@ -242,9 +254,9 @@ def format_time_ago(dt: datetime) -> str:
     days = seconds // 86400
     return f"{days} day{'s' if days > 1 else ''} ago"
 
-@st.cache_data
+@st.cache_resource
 def get_global_css() -> str:
-    """Return global CSS styling for the app (cached)."""
+    """Return global CSS styling for the app (cached across sessions)."""
     return """
     <style>
     /* Import custom fonts */
@@ -336,10 +348,6 @@ def get_global_css() -> str:
     .reset-button div > button:focus {
         box-shadow: none !important;
     }
-    /* Hide autorefresh iframe (used for timer) */
-    iframe[title="streamlit_autorefresh.st_autorefresh"] {
-        display: none;
-    }
     /* Dataframe header style */
     .stDataFrame thead th {
         font-weight: 800 !important;
@@ -359,18 +367,36 @@ def get_global_css() -> str:
         color: #6b6b6b;
         font-size: 14px;
     }
+    .kpi-row {
+        display: flex;
+        gap: 1rem;
+    }
+    .kpi-row .kpi-card {
+        flex: 1;
+    }
     </style>
     """
 
-@st.cache_data
+@st.cache_resource
 def get_logo_base64(logo_path: str) -> str:
-    """Return base64-encoded string of the logo image (cached)."""
+    """Return base64-encoded string of the logo image (cached across sessions)."""
     try:
         data = Path(logo_path).read_bytes()
         return base64.b64encode(data).decode("utf-8")
     except Exception:
         return ""
 
+@st.cache_resource
+def get_page_header_html(title: str) -> str:
+    """Return the page header markup with the logo inlined as a data URI (cached per title)."""
+    logo_b64 = get_logo_base64(str(config.LOGO_PATH))
+    return f"""
+    <div class="header-row">
+        <img class="header-logo" src="data:image/png;base64,{logo_b64}" />
+        <h1 class="header-title">{title}</h1>
+    </div>
+    """
+
 @lru_cache(maxsize=1)
 def find_task_tracker_root() -> Path:
     """Locate Task-Tracker folder from configured roots."""
@@ -387,13 +413,25 @@ def find_task_tracker_root() -> Path:
                 return candidate
     raise FileNotFoundError("Task-Tracker folder not found. Ensure SharePoint is synced locally.")
 
-def atomic_write_parquet(df: pd.DataFrame, path: Path, schema: pa.Schema = PARQUET_SCHEMA) -> None:
-    """Atomically write DataFrame to a Parquet file at the given path."""
+def record_to_table(record: dict, schema: pa.Schema = PARQUET_SCHEMA) -> pa.Table:
+    """Build a one-row Arrow table straight from a record dict (no pandas round-trip)."""
+    arrays = [pa.array([record.get(field.name)], type=field.type) for field in schema]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def atomic_write_parquet(data: pd.DataFrame | dict, path: Path, schema: pa.Schema = PARQUET_SCHEMA) -> None:
+    """Atomically write a DataFrame (or a single record dict) to a Parquet file at the given path."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(".parquet.tmp")
-    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
-    pq.write_table(table, tmp_path)
-    tmp_path.replace(path)
+    # Unique temp name so concurrent writers never share (or clobber) the same temp file.
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    if isinstance(data, dict):
+        table = record_to_table(data, schema)
+    else:
+        table = pa.Table.from_pandas(data, schema=schema, preserve_index=False)
+    try:
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 def build_out_dir(completed_dir: Path, user_key: str, ts: datetime) -> Path:
     if ts.tzinfo is None:
@@ -445,9 +483,8 @@ def save_live_activity(
         "PausedSeconds": paused_seconds,
         "PauseStartTimestampUTC": pause_start_utc,
     }
-    df = pd.DataFrame([record])
     path = live_activity_dir / f"user={user_key}.parquet"
-    atomic_write_parquet(df, path, schema=LIVE_ACTIVITY_SCHEMA)
+    atomic_write_parquet(record, path, schema=LIVE_ACTIVITY_SCHEMA)
 
 def update_live_activity_state(
     live_activity_dir: Path,
@@ -540,14 +577,13 @@ def save_archived_task(
         "ArchivedTimestampUTC": now_utc(),
         "AppVersion": config.APP_VERSION,
     }
-    df = pd.DataFrame([record])
     start_eastern = to_eastern(start_utc)
     path = (
         archived_tasks_dir
         / f"user={user_key}"
         / f"archive_{start_eastern:%Y%m%d_%H%M%S}_{archive_id[:8]}.parquet"
     )
-    atomic_write_parquet(df, path, schema=ARCHIVED_TASK_SCHEMA)
+    atomic_write_parquet(record, path, schema=ARCHIVED_TASK_SCHEMA)
     return path
 
 @st.cache_data(ttl=15)
@@ -645,11 +681,26 @@ def load_all_completed_tasks(base_dir: Path) -> pd.DataFrame:
         return pd.DataFrame()
     try:
         dataset = ds.dataset(files, format="parquet")
-        df = dataset.to_table().to_pandas()
-        # Ensure timestamp columns are proper datetime and add a date field
+        # Only the columns the analytics page reads; older files may lack some of them.
+        wanted_cols = [
+            "FullName",
+            "TaskName",
+            "TaskCadence",
+            "DurationSeconds",
+            "StartTimestampUTC",
+        ]
+        columns = [col for col in wanted_cols if col in dataset.schema.names]
+        df = dataset.to_table(columns=columns).to_pandas()
+        # Ensure the start timestamp is a proper datetime and add a date field
         df["StartTimestampUTC"] = pd.to_datetime(df["StartTimestampUTC"], utc=True)
-        df["EndTimestampUTC"] = pd.to_datetime(df["EndTimestampUTC"], utc=True)
-        df["Date"] = df["StartTimestampUTC"].dt.date
+        # Day-resolution datetime64 (not datetime.date objects) keeps Date groupbys/compares vectorized.
+        df["Date"] = df["StartTimestampUTC"].dt.tz_localize(None).to_numpy().astype("datetime64[D]")
+        if "DurationSeconds" in df.columns:
+            df["DurationSeconds"] = pd.to_numeric(df["DurationSeconds"], downcast="integer")
+        # Low-cardinality text columns: categories make filter options and isin masks cheap.
+        for col in ("FullName", "TaskName", "TaskCadence"):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
         return df
     except Exception as e:
         st.error(f"Failed to load completed tasks: {e}")